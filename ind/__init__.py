@@ -1,5 +1,9 @@
 # __init__.py
+from .bars import BarSeries
+from .patterns import PatternScan
+from .plugins import IndicatorContext, register_indicator
 from .processor import IndicatorProcessor
+from .sweep import SweepResult
 
 __version__ = "0.1.0"
-__all__ = ["IndicatorProcessor"]
+__all__ = ["BarSeries", "IndicatorContext", "IndicatorProcessor", "PatternScan", "SweepResult", "register_indicator"]
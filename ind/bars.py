@@ -0,0 +1,141 @@
+# bars.py
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .normalize import wall_clock
+
+# Frame column -> BarSeries field
+FIELDS = {
+    "Adj Close": "adj_close",
+    "Close": "close",
+    "High": "high",
+    "Low": "low",
+    "Open": "open",
+    "Volume": "volume",
+}
+
+
+def _float_array(values) -> np.ndarray:
+    """Contiguous float64 array; no copy when the input already is one."""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+class BarSeries:
+    """
+    Columnar OHLCV bars for one ticker, without DataFrame overhead.
+
+    Every field is a contiguous float64 array and timestamps are int64
+    nanoseconds, so the indicator kernels read the arrays directly. Basic
+    slicing (bars[a:b], bars.between(start, end)) returns views that share
+    memory with the parent. Computed indicator columns live in
+    self.columns; to_frame() builds a pandas DataFrame only when asked.
+    Timestamps are local wall-clock time; a tz-aware source keeps its time
+    zone in self.tz and to_frame() restores it.
+    """
+
+    __slots__ = ("ticker", "timestamps", "open", "high", "low", "close", "volume", "adj_close", "columns", "tz")
+
+    def __init__(self, timestamps, open, high, low, close, volume, adj_close=None,
+                 ticker: Optional[str] = None, columns: Optional[Dict[str, np.ndarray]] = None, tz=None):
+        """
+        Args:
+            timestamps: int64 nanoseconds or datetime64 values, sorted and unique
+            open, high, low, close, volume: Price and volume arrays
+            adj_close: Optional adjusted close (defaults to close)
+            ticker: Optional ticker name
+            columns: Optional computed columns, one value per bar
+            tz: Optional time zone of the source timestamps (they stay wall-clock here)
+        """
+        timestamps = np.asarray(timestamps)
+        if timestamps.dtype.kind == "M":
+            timestamps = timestamps.astype("datetime64[ns]").view(np.int64)
+        self.timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+        self.open = _float_array(open)
+        self.high = _float_array(high)
+        self.low = _float_array(low)
+        self.close = _float_array(close)
+        self.volume = _float_array(volume)
+        self.adj_close = self.close if adj_close is None else _float_array(adj_close)
+        self.ticker = ticker
+        self.tz = tz
+        self.columns: Dict[str, np.ndarray] = dict(columns) if columns else {}
+        n = len(self.timestamps)
+        for name in ("open", "high", "low", "close", "volume", "adj_close"):
+            if len(getattr(self, name)) != n:
+                raise ValueError(f"BarSeries field {name} has {len(getattr(self, name))} values, expected {n}")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, ticker: Optional[str] = None) -> "BarSeries":
+        """Build from a loaded frame with Datetime and OHLCV columns (other columns are ignored)."""
+        return cls(
+            wall_clock(df["Datetime"]),
+            df["Open"].to_numpy(), df["High"].to_numpy(), df["Low"].to_numpy(),
+            df["Close"].to_numpy(), df["Volume"].to_numpy(),
+            df["Adj Close"].to_numpy() if "Adj Close" in df.columns else None,
+            ticker=ticker,
+            tz=getattr(df["Datetime"].dtype, "tz", None),
+        )
+
+    @property
+    def datetimes(self) -> np.ndarray:
+        """Timestamps as a datetime64[ns] view."""
+        return self.timestamps.view("datetime64[ns]")
+
+    @property
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Price arrays keyed by frame column name (Open, High, Low, Close, Volume)."""
+        return {"Open": self.open, "High": self.high, "Low": self.low, "Close": self.close, "Volume": self.volume}
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays (views count their full length)."""
+        fields = [self.timestamps, self.open, self.high, self.low, self.close, self.volume]
+        if self.adj_close is not self.close:
+            fields.append(self.adj_close)
+        return sum(a.nbytes for a in fields) + sum(np.asarray(c).nbytes for c in self.columns.values())
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index: slice) -> "BarSeries":
+        """Slice every field (and computed column); a step-1 slice shares memory with self."""
+        if not isinstance(index, slice):
+            raise TypeError("BarSeries only supports slicing, e.g. bars[-500:]")
+        return BarSeries(
+            self.timestamps[index], self.open[index], self.high[index], self.low[index],
+            self.close[index], self.volume[index],
+            None if self.adj_close is self.close else self.adj_close[index],
+            ticker=self.ticker,
+            columns={name: values[index] for name, values in self.columns.items()},
+            tz=self.tz,
+        )
+
+    def between(self, start=None, end=None) -> "BarSeries":
+        """View of the bars with start <= Datetime <= end (binary search on the sorted timestamps)."""
+        lo = 0 if start is None else int(np.searchsorted(self.timestamps, pd.Timestamp(start).value, "left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.timestamps, pd.Timestamp(end).value, "right"))
+        return self[lo:hi]
+
+    def to_frame(self, include_columns: bool = True) -> pd.DataFrame:
+        """
+        Convert to a DataFrame in the input column order, followed by computed columns.
+
+        Args:
+            include_columns: Also add the computed columns
+        """
+        datetimes = self.datetimes.copy()
+        if self.tz is not None:
+            datetimes = pd.DatetimeIndex(datetimes).tz_localize(self.tz, ambiguous="infer", nonexistent="shift_forward")
+        data = {"Datetime": datetimes}
+        for column, field in FIELDS.items():
+            data[column] = getattr(self, field)
+        if include_columns:
+            data.update(self.columns)
+        return pd.DataFrame(data)
+
+    def __repr__(self) -> str:
+        span = f"{self.datetimes[0]} .. {self.datetimes[-1]}" if len(self) else "empty"
+        return f"BarSeries({self.ticker!r}, {len(self)} bars, {span}, {len(self.columns)} columns)"
@@ -0,0 +1,308 @@
+# batch.py
+
+import csv
+import json
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+from .processor import IndicatorProcessor
+from .reader import COLUMN_NAMES
+from .storage import DATABASE_FILES
+from .writer import COMPRESSION_SUFFIXES
+
+# Written to the output folder by run_batch
+JOURNAL_FILE = "run_journal.jsonl"
+QUARANTINE_FILE = "quarantine.json"
+# Per-run manifests go in a subfolder so they never match the outputs' *.csv glob
+MANIFEST_FOLDER = "manifests"
+MANIFEST_HISTORY = "history.jsonl"
+
+# Per-file manifest columns, in CSV order
+MANIFEST_FIELDS = ["file", "ticker", "status", "attempts", "input_bytes", "rows_read", "rows", "duplicates",
+                   "out_of_order", "indicators", "parse_s", "compute_s", "write_s", "total_s", "output_bytes", "error"]
+
+# Slowest files listed in the run aggregates
+SLOWEST_FILES = 5
+
+
+class ProcessOptions(NamedTuple):
+    """Per-file processing settings shared by the batch CLI and watch mode."""
+    fmt: str = "csv"
+    float_format: Union[int, str, None] = None
+    compression: Optional[str] = None
+    threads: int = 1
+    processes: int = 1
+    append: bool = False
+    partition: str = "year"
+    online: bool = False
+
+
+def output_path(file_path: Path, output_folder: Path, options: ProcessOptions) -> Path:
+    """Where save_results writes the output for file_path."""
+    if options.fmt in DATABASE_FILES:
+        return Path(output_folder) / DATABASE_FILES[options.fmt]
+    if options.fmt == "dataset":
+        return Path(output_folder) / f"ticker={Path(file_path).stem}"
+    suffix = f".{options.fmt}"
+    if options.fmt == "csv" and options.compression:
+        suffix += COMPRESSION_SUFFIXES[options.compression]
+    return Path(output_folder) / f"{Path(file_path).stem}{suffix}"
+
+
+def _size(path: Path) -> int:
+    """Bytes of a file, or of every file below a folder (dataset output)."""
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return path.stat().st_size if path.exists() else 0
+
+
+def process_file(file_path: Path, output_folder: Path, options: ProcessOptions = ProcessOptions(),
+                 record: Optional[dict] = None) -> IndicatorProcessor:
+    """
+    Load one file, add the default indicators and save the result.
+
+    A fresh IndicatorProcessor is used for every file so no state carries
+    over between files.
+
+    Args:
+        file_path: Input CSV
+        output_folder: Folder for results
+        options: Processing settings
+        record: Optional dict filled with row counts, per-stage timings
+            (parse_s, compute_s, write_s) and output bytes as each stage
+            completes, so it is partially filled when a stage fails
+
+    Returns:
+        The processor, for callers that want to inspect the result
+    """
+    record = {} if record is None else record
+    processor = IndicatorProcessor()
+
+    start = time.perf_counter()
+    processor.load_data(str(file_path))
+    record["parse_s"] = time.perf_counter() - start
+    stats = processor.load_stats
+    record.update(rows_read=stats.rows_read, rows=len(processor.df), duplicates=stats.duplicates,
+                  out_of_order=stats.out_of_order)
+
+    start = time.perf_counter()
+    processor.add_default_indicators(threads=options.threads, processes=options.processes, online=options.online)
+    record["compute_s"] = time.perf_counter() - start
+    record["indicators"] = len(processor.df.columns) - len(COLUMN_NAMES)
+
+    start = time.perf_counter()
+    processor.save_results(str(output_folder), fmt=options.fmt, float_format=options.float_format,
+                           compression=options.compression, append=options.append,
+                           partition=options.partition)
+    record["write_s"] = time.perf_counter() - start
+    record["output_bytes"] = _size(output_path(file_path, output_folder, options))
+    return processor
+
+
+class BatchResult(NamedTuple):
+    """Files of one run_batch call, by outcome, and the run manifest."""
+    processed: List[Path]
+    failed: List[Path]
+    skipped: List[Path]
+    manifest: dict
+
+
+def summarize_run(records: List[dict], wall_s: float) -> dict:
+    """
+    Run-level aggregates over the per-file manifest records.
+
+    Returns:
+        Dict with file counts, totals, throughput (rows/s and MB/s over
+        the wall time), p50/p95 per-file latency and the slowest files
+    """
+    done = [r for r in records if r["status"] == "done"]
+    latencies = np.array([r["total_s"] for r in done])
+    rows = sum(r.get("rows", 0) for r in done)
+    input_bytes = sum(r.get("input_bytes", 0) for r in done)
+    slowest = sorted(records, key=lambda r: r["total_s"], reverse=True)[:SLOWEST_FILES]
+    return {
+        "files": len(records),
+        "done": len(done),
+        "failed": len(records) - len(done),
+        "wall_s": round(wall_s, 3),
+        "rows": rows,
+        "input_bytes": input_bytes,
+        "output_bytes": sum(r.get("output_bytes", 0) for r in done),
+        "rows_per_s": round(rows / wall_s, 1) if wall_s > 0 else None,
+        "input_mb_per_s": round(input_bytes / 1e6 / wall_s, 3) if wall_s > 0 else None,
+        "p50_file_s": round(float(np.percentile(latencies, 50)), 3) if len(done) else None,
+        "p95_file_s": round(float(np.percentile(latencies, 95)), 3) if len(done) else None,
+        "slowest": [{"file": r["file"], "total_s": r["total_s"], "status": r["status"]} for r in slowest],
+    }
+
+
+def write_manifest(output_folder: Path, records: List[dict], run: dict) -> Path:
+    """
+    Write the manifest of one run into <output_folder>/manifests.
+
+    Every run gets its own run-<started>.json (run aggregates and per-file
+    records) and run-<started>.csv (one row per file), so a resumed run
+    keeps the records of the runs before it; the run aggregates are also
+    appended to history.jsonl.
+
+    Returns:
+        Path of the run's JSON manifest
+    """
+    folder = Path(output_folder) / MANIFEST_FOLDER
+    folder.mkdir(parents=True, exist_ok=True)
+    base = stem = "run-" + run["started"].replace("-", "").replace(":", "")
+    suffix = 1
+    while (folder / f"{stem}.json").exists():
+        suffix += 1
+        stem = f"{base}.{suffix}"
+    json_path = folder / f"{stem}.json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"run": run, "files": records}, f, indent=2)
+    with open(folder / f"{stem}.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=MANIFEST_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(records)
+    with open(folder / MANIFEST_HISTORY, "a", encoding="utf-8") as f:
+        f.write(json.dumps({**run, "manifest": json_path.name}) + "\n")
+    return json_path
+
+
+def _journal_entry(journal, **entry) -> None:
+    """Append one event and flush it, so the journal survives a crash."""
+    entry["time"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    journal.write(json.dumps(entry) + "\n")
+    journal.flush()
+
+
+def read_journal(output_folder: Path) -> Dict[str, str]:
+    """
+    Last recorded status of every file in the run journal.
+
+    Returns:
+        Dict of file path -> "pending", "started", "done" or "failed"
+    """
+    path = Path(output_folder) / JOURNAL_FILE
+    if not path.exists():
+        raise ValueError(f"No run journal found in {output_folder}")
+    status: Dict[str, str] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A line cut short by a crash
+                continue
+            if entry.get("event") == "run":
+                for file in entry["files"]:
+                    status.setdefault(file, "pending")
+            elif "file" in entry:
+                status[entry["file"]] = entry["event"]
+    return status
+
+
+def run_batch(files: Iterable[Path], output_folder: Path, options: ProcessOptions = ProcessOptions(),
+              resume: bool = False, retries: int = 0) -> BatchResult:
+    """
+    Process files one by one with per-file isolation, a run journal and a quarantine report.
+
+    Every file gets a fresh processor, so nothing leaks between files, and
+    a failure never stops the run. Each start, success and failure is
+    appended to <output_folder>/run_journal.jsonl. Files that still fail
+    after retries are listed with their error in
+    <output_folder>/quarantine.json. With resume, files already done in
+    the journal are skipped, so only failed and unfinished files of the
+    interrupted run are processed again.
+
+    Args:
+        files: Files to process (ignored with resume, which uses the journal's file list)
+        output_folder: Folder for results, journal and quarantine report
+        options: Per-file processing settings
+        resume: Continue the run recorded in the journal
+        retries: Extra attempts for a failing file before it is quarantined
+
+    A per-file manifest (input size, rows, duplicates dropped, indicator
+    columns, parse/compute/write timings, output bytes, status) and the
+    run aggregates from summarize_run are written to a per-run manifest
+    in <output_folder>/manifests (see write_manifest).
+
+    Returns:
+        BatchResult
+    """
+    output_folder = Path(output_folder)
+    output_folder.mkdir(parents=True, exist_ok=True)
+    quarantine_path = output_folder / QUARANTINE_FILE
+
+    skipped: List[Path] = []
+    quarantine: Dict[str, dict] = {}
+    if resume:
+        status = read_journal(output_folder)
+        files = [Path(f) for f, state in status.items() if state != "done"]
+        skipped = [Path(f) for f, state in status.items() if state == "done"]
+        if quarantine_path.exists():
+            with open(quarantine_path, encoding="utf-8") as f:
+                quarantine = {entry["file"]: entry for entry in json.load(f)}
+        mode = "a"
+    else:
+        files = [Path(f).resolve() for f in files]
+        mode = "w"
+
+    processed: List[Path] = []
+    failed: List[Path] = []
+    records: List[dict] = []
+    run_start = time.perf_counter()
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with open(output_folder / JOURNAL_FILE, mode, encoding="utf-8") as journal:
+        if not resume:
+            _journal_entry(journal, event="run", files=[str(f) for f in files], output_folder=str(output_folder))
+        for file_path in files:
+            print(f"Processing {file_path.name}...")
+            _journal_entry(journal, event="started", file=str(file_path))
+            file_start = time.perf_counter()
+            for attempt in range(1, retries + 2):
+                record = {"file": str(file_path), "ticker": file_path.stem, "attempts": attempt,
+                          "input_bytes": _size(file_path)}
+                try:
+                    process_file(file_path, output_folder, options, record)
+                except Exception as e:
+                    error = {
+                        "file": str(file_path),
+                        "error": type(e).__name__,
+                        "message": str(e),
+                        "traceback": traceback.format_exc(),
+                        "attempts": attempt,
+                        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    }
+                    continue
+                error = None
+                break
+
+            record["status"] = "done" if error is None else "failed"
+            record["total_s"] = time.perf_counter() - file_start
+            record["error"] = error["message"] if error else None
+            for key in ("parse_s", "compute_s", "write_s", "total_s"):
+                if key in record:
+                    record[key] = round(record[key], 4)
+            records.append(record)
+
+            if error is None:
+                processed.append(file_path)
+                quarantine.pop(str(file_path), None)
+                _journal_entry(journal, event="done", file=str(file_path))
+                print(f"Successfully processed {file_path.name}")
+            else:
+                failed.append(file_path)
+                quarantine[str(file_path)] = error
+                _journal_entry(journal, event="failed", file=str(file_path), error=error["message"])
+                print(f"Error processing {file_path.name}: {error['message']}")
+
+    with open(quarantine_path, "w", encoding="utf-8") as f:
+        json.dump(list(quarantine.values()), f, indent=2)
+
+    run = summarize_run(records, time.perf_counter() - run_start)
+    run.update(started=started_at, resumed=resume, skipped=len(skipped), options=options._asdict())
+    run["manifest"] = str(write_manifest(output_folder, records, run))
+    return BatchResult(processed, failed, skipped, run)
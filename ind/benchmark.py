@@ -0,0 +1,121 @@
+# benchmark.py
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import talib
+
+from .processor import DEFAULT_INDICATORS, IndicatorProcessor
+
+
+def measure(func: Callable, repeat: int = 1, setup: Optional[Callable] = None) -> Dict[str, float]:
+    """
+    Time func and count the memory it allocates.
+
+    Args:
+        func: Zero-argument callable
+        repeat: Number of timed runs (best time is reported)
+        setup: Optional callable run untimed and untraced before each run
+
+    Returns:
+        Dict with seconds, allocations (blocks still held after the call,
+        including the result), allocated_mb and peak_mb
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = func()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    stats = after.compare_to(before, "filename")
+    return {
+        "seconds": best,
+        "allocations": sum(max(s.count_diff, 0) for s in stats),
+        "allocated_mb": sum(max(s.size_diff, 0) for s in stats) / 2**20,
+        "peak_mb": peak / 2**20,
+    }
+
+
+def bench_talib_inputs(processor: IndicatorProcessor, repeat: int = 5) -> List[dict]:
+    """Compare TA-Lib calls fed with pandas Series against the processor's contiguous arrays."""
+    series = processor.df["Close"]
+    array = processor.arrays["Close"]
+    rows = []
+    for label, data in (("Series", series), ("ndarray", array)):
+        row = measure(lambda: talib.EMA(data, timeperiod=20), repeat)
+        row["case"] = f"talib.EMA({label})"
+        rows.append(row)
+    return rows
+
+
+def bench_indicators(file_path: str, repeat: int = 1) -> List[dict]:
+    """Time and allocation counts for load_data and each default indicator family."""
+    processor = IndicatorProcessor()
+    row = measure(lambda: processor.load_data(file_path), repeat)
+    row["case"] = "load_data"
+    rows = [row]
+    for name, kwargs in DEFAULT_INDICATORS:
+        # Each run starts from the freshly loaded frame
+        base = processor.df
+        def reset():
+            processor.df = base.copy()
+        row = measure(lambda: processor.add_indicator(name, **kwargs), repeat, setup=reset)
+        row["case"] = name
+        rows.append(row)
+        processor.df = base
+    return rows
+
+
+def bench_threads(file_path: str, threads: List[int], repeat: int = 1) -> List[dict]:
+    """Scaling of add_default_indicators across thread counts."""
+    processor = IndicatorProcessor()
+    rows = []
+    for count in threads:
+        def reset():
+            processor.load_data(file_path)
+        row = measure(lambda: processor.add_default_indicators(threads=count), repeat, setup=reset)
+        row["case"] = f"threads={count}"
+        rows.append(row)
+    serial = rows[0]["seconds"]
+    for row in rows:
+        row["speedup"] = serial / row["seconds"]
+    return rows
+
+
+def main():
+    """Entry point: python -m ind.benchmark path/to/file.csv"""
+    parser = argparse.ArgumentParser(description="Benchmark indicator computation.")
+    parser.add_argument("file", type=str, help="CSV file to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (best is reported)")
+    parser.add_argument("--threads", type=int, nargs="*", help="Also report scaling across these thread counts, e.g. 1 2 4 8 16")
+    args = parser.parse_args()
+
+    rows = bench_indicators(args.file, args.repeat)
+    processor = IndicatorProcessor()
+    processor.load_data(args.file)
+    rows += bench_talib_inputs(processor, args.repeat)
+    if args.threads:
+        rows += bench_threads(args.file, args.threads, args.repeat)
+
+    table = pd.DataFrame(rows).set_index("case")
+    with pd.option_context("display.float_format", "{:.4f}".format):
+        print(table.to_string())
+
+
+if __name__ == "__main__":
+    main()
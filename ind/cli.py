@@ -2,18 +2,63 @@
 import os
 import argparse
 from pathlib import Path
-from .processor import IndicatorProcessor
+from .batch import ProcessOptions, run_batch
 from typing import Optional
 
 def main():
     """Main entry point for the indicators CLI."""
     parser = argparse.ArgumentParser(description="Process financial data and generate technical indicators.")
+    parser.add_argument("mode", nargs="?", choices=["run", "watch"], default="run",
+                        help="run: process files once (default); watch: keep running and process new or modified files")
     parser.add_argument("--input-folder", type=str, help="Path to input folder containing CSV files")
     parser.add_argument("--output-folder", type=str, help="Path to output folder for processed files")
     parser.add_argument("--file", type=str, help="Specific CSV file to process")
+    parser.add_argument("--format", type=str, choices=["csv", "parquet", "dataset", "sqlite", "duckdb"], default="csv",
+                        help="Output format; dataset writes a Hive-partitioned Parquet dataset, sqlite/duckdb upsert every ticker into one database (parquet/dataset require pyarrow, duckdb requires duckdb)")
+    parser.add_argument("--partition", type=str, choices=["year", "month"], default="year", help="Dataset output: partitions below the ticker")
+    parser.add_argument("--float-format", type=str, help="CSV float output: decimals to keep (e.g. 4) or a printf format such as %%.6g")
+    parser.add_argument("--compression", type=str, choices=["gzip", "zstd"], help="Compress CSV output while writing (zstd requires zstandard)")
+    parser.add_argument("--append", action="store_true", help="Append only new rows to existing CSV outputs (rewrite from the first changed row otherwise)")
+    parser.add_argument("--online", action="store_true", help="Point-in-time session indicators for backtests (running POC, gap types from past gaps only)")
+    parser.add_argument("--threads", type=int, default=1, help="Threads used to compute indicator families in parallel")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes (sharing the price arrays in shared memory) per file")
+    parser.add_argument("--resume", action="store_true", help="Reprocess only failed and unfinished files of the last run (from its journal)")
+    parser.add_argument("--retries", type=int, default=0, help="Extra attempts for a failing file before it is quarantined")
+    parser.add_argument("--workers", type=int, default=2, help="Watch mode: files processed concurrently")
+    parser.add_argument("--debounce", type=float, default=2.0, help="Watch mode: seconds a file must be unchanged before processing")
+    parser.add_argument("--interval", type=float, default=1.0, help="Watch mode: event wait / polling interval in seconds")
+    parser.add_argument("--poll", action="store_true", help="Watch mode: poll the folder instead of using inotify")
+    parser.add_argument("--stats-interval", type=float, default=60.0, help="Watch mode: seconds between counter printouts (0 disables)")
     args = parser.parse_args()
 
-    processor = IndicatorProcessor()
+    options = ProcessOptions(fmt=args.format, float_format=args.float_format, compression=args.compression,
+                             threads=args.threads, processes=args.processes, append=args.append,
+                             partition=args.partition, online=args.online)
+
+    if args.mode == "watch":
+        from .watch import watch
+        input_folder = Path(args.input_folder or "./data").resolve()
+        output_folder = Path(args.output_folder).resolve() if args.output_folder else input_folder.parent / f"{input_folder.name}_ind"
+        try:
+            watch(input_folder, output_folder, options, workers=args.workers, debounce=args.debounce,
+                  interval=args.interval, use_inotify=not args.poll, stats_interval=args.stats_interval)
+        except KeyboardInterrupt:
+            print("Stopped watching")
+        return
+
+    if args.resume:
+        if not args.input_folder and not args.output_folder:
+            print("--resume needs --input-folder or --output-folder")
+            return
+        input_folder = Path(args.input_folder or ".").resolve()
+        output_folder = Path(args.output_folder).resolve() if args.output_folder else input_folder.parent / f"{input_folder.name}_ind"
+        try:
+            result = run_batch([], output_folder, options, resume=True, retries=args.retries)
+        except ValueError as e:
+            print(str(e))
+            return
+        print(f"Resumed run: {len(result.processed)} processed, {len(result.failed)} failed, {len(result.skipped)} already done")
+        return
 
     if not args.input_folder:
         # Interactive mode
@@ -56,15 +101,13 @@ def main():
     output_folder = Path(args.output_folder).resolve() if args.output_folder else input_folder.parent / f"{input_folder.name}_ind"
     output_folder.mkdir(exist_ok=True)
 
-    for file_path in files_to_process:
-        print(f"Processing {file_path.name}...")
-        try:
-            processor.load_data(str(file_path))
-            processor.add_default_indicators()
-            processor.save_results(str(output_folder))
-            print(f"Successfully processed {file_path.name}")
-        except Exception as e:
-            print(f"Error processing {file_path.name}: {str(e)}")
+    result = run_batch(files_to_process, output_folder, options, retries=args.retries)
+    run = result.manifest
+    if run["done"]:
+        print(f"{run['done']} file(s), {run['rows']} rows in {run['wall_s']}s ({run['rows_per_s']} rows/s, "
+              f"p50 {run['p50_file_s']}s, p95 {run['p95_file_s']}s per file); manifest in {run['manifest']}")
+    if result.failed:
+        print(f"{len(result.failed)} file(s) failed; see {output_folder / 'quarantine.json'} and rerun with --resume")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,124 @@
+# dataset.py
+
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import pandas as pd
+
+# Partition layouts below the ticker level
+PARTITIONS = {"year": ["year"], "month": ["year", "month"]}
+
+# Rows per Parquet row group; each group carries min/max statistics on Datetime
+DEFAULT_ROW_GROUP_ROWS = 65_536
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError:
+        raise ValueError("Parquet datasets require the pyarrow package")
+    return pa, ds
+
+
+def _partitioning(partition: str):
+    pa, ds = _pyarrow()
+    if partition not in PARTITIONS:
+        raise ValueError(f"Unsupported partition: {partition}")
+    fields = [pa.field("ticker", pa.string())]
+    fields += [pa.field(name, pa.int16() if name == "year" else pa.int8()) for name in PARTITIONS[partition]]
+    return ds.partitioning(pa.schema(fields), flavor="hive")
+
+
+def write_dataset(df: pd.DataFrame, root: Union[str, Path], ticker: str, partition: str = "year",
+                  row_group_rows: int = DEFAULT_ROW_GROUP_ROWS) -> Path:
+    """
+    Write one ticker into a Hive-partitioned Parquet dataset.
+
+    Files land in root/ticker=<T>/year=<Y>[/month=<M>]/. Rows stay sorted
+    by Datetime, so the per-row-group min/max statistics let readers skip
+    row groups outside a date range. Partitions written for the ticker
+    replace the previous files in the same partitions; other tickers and
+    periods are left alone.
+
+    Args:
+        df: Frame with a Datetime column
+        root: Dataset root folder
+        ticker: Ticker partition value
+        partition: "year" or "month"
+        row_group_rows: Rows per row group
+
+    Returns:
+        The ticker's partition folder
+    """
+    pa, ds = _pyarrow()
+    partitioning = _partitioning(partition)
+    frame = df.copy()
+    frame["ticker"] = ticker
+    frame["year"] = frame["Datetime"].dt.year.astype("int16")
+    if partition == "month":
+        frame["month"] = frame["Datetime"].dt.month.astype("int8")
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    ds.write_dataset(table, str(root), format="parquet", partitioning=partitioning,
+                     existing_data_behavior="delete_matching", basename_template="part-{i}.parquet",
+                     max_rows_per_group=row_group_rows, min_rows_per_group=min(row_group_rows, max(len(frame), 1)))
+    return Path(root) / f"ticker={ticker}"
+
+
+def read_dataset(root: Union[str, Path], tickers: Optional[Sequence[str]] = None, start=None, end=None,
+                 columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Load a date range for a set of tickers from a partitioned dataset.
+
+    Only the requested tickers' folders are listed, the year filter prunes
+    partition folders below them, and the Datetime
+    filter is pushed down to the Parquet row-group statistics, so only the
+    row groups overlapping [start, end] are read, and only the requested
+    columns are decoded.
+
+    Args:
+        root: Dataset root folder
+        tickers: Tickers to load (all by default)
+        start: Only rows at or after this timestamp
+        end: Only rows at or before this timestamp
+        columns: Columns to load besides ticker and Datetime (all by default)
+
+    Returns:
+        Frame sorted by ticker and Datetime
+    """
+    pa, ds = _pyarrow()
+    root = Path(root)
+    if not root.exists():
+        raise ValueError(f"Dataset not found: {root}")
+    # Only list the requested tickers' folders; other files in root are ignored
+    folders = [root / f"ticker={t}" for t in tickers] if tickers is not None else sorted(root.glob("ticker=*"))
+    paths = [str(path) for folder in folders for path in sorted(folder.glob("**/*.parquet"))]
+    if not paths:
+        raise ValueError(f"No dataset files found in {root}")
+    dataset = ds.dataset(paths, format="parquet", partitioning="hive", partition_base_dir=str(root))
+    stamp_type = dataset.schema.field("Datetime").type
+
+    conditions: List = []
+    if tickers is not None:
+        conditions.append(ds.field("ticker").isin(list(tickers)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        conditions.append(ds.field("year") >= start.year)
+        conditions.append(ds.field("Datetime") >= pa.scalar(start, type=stamp_type))
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions.append(ds.field("year") <= end.year)
+        conditions.append(ds.field("Datetime") <= pa.scalar(end, type=stamp_type))
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    names = dataset.schema.names
+    if columns is not None:
+        selected = ["ticker", "Datetime"] + [c for c in columns if c not in ("ticker", "Datetime")]
+    else:
+        selected = [c for c in names if c not in PARTITIONS["month"]]
+    table = dataset.to_table(columns=selected, filter=expression)
+    df = table.to_pandas()
+    df["ticker"] = df["ticker"].astype(str)
+    return df.sort_values(["ticker", "Datetime"], kind="stable").reset_index(drop=True)
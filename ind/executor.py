@@ -0,0 +1,38 @@
+# executor.py
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def run_indicators(compute: Callable[..., Dict[str, np.ndarray]], indicators: List[Tuple[str, dict]],
+                   threads: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Compute independent indicator families, optionally on a thread pool.
+
+    Each family reads the same read-only input arrays and returns its own
+    output columns, so workers share nothing writable. TA-Lib and NumPy
+    release the GIL inside their C loops, which is where the time goes.
+    Outputs are merged in the order of indicators, so the column layout is
+    the same as a serial run.
+
+    Args:
+        compute: Function (name, **kwargs) -> {column: values}
+        indicators: (name, kwargs) pairs
+        threads: Worker threads (None or 1 for serial)
+
+    Returns:
+        Merged dict of output columns
+    """
+    if threads and threads > 1 and len(indicators) > 1:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            futures = [pool.submit(compute, name, **kwargs) for name, kwargs in indicators]
+            results = [future.result() for future in futures]
+    else:
+        results = [compute(name, **kwargs) for name, kwargs in indicators]
+
+    merged: Dict[str, np.ndarray] = {}
+    for columns in results:
+        merged.update(columns)
+    return merged
@@ -0,0 +1,76 @@
+# normalize.py
+
+import numpy as np
+import pandas as pd
+from typing import NamedTuple, Tuple
+
+
+class NormalizeStats(NamedTuple):
+    """
+    Summary of the dedup/sort stage of load_data.
+
+    Attributes:
+        rows_read: Rows parsed from the file
+        out_of_order: Rows whose timestamp is earlier than one already seen above them
+        duplicates: Rows dropped because a later row had the same timestamp
+        sorted: Whether a sort was needed
+    """
+    rows_read: int
+    out_of_order: int
+    duplicates: int
+    sorted: bool
+
+
+def wall_clock(datetimes: pd.Series) -> np.ndarray:
+    """
+    Datetime column as naive datetime64[ns] in local (wall-clock) time.
+
+    Sessions, pivots and resampling work on calendar days, so tz-aware
+    columns (e.g. 2025-07-31 09:30:00-04:00) drop their offset rather than
+    being converted to UTC.
+    """
+    if isinstance(datetimes.dtype, pd.DatetimeTZDtype):
+        datetimes = datetimes.dt.tz_localize(None)
+    return datetimes.to_numpy(dtype="datetime64[ns]")
+
+
+def normalize_bars(df: pd.DataFrame) -> Tuple[pd.DataFrame, NormalizeStats]:
+    """
+    Convert Datetime, drop duplicate timestamps (keeping the last) and sort.
+
+    Already chronological input is detected in one linear pass; duplicates
+    are then adjacent and removed with a vectorized neighbour comparison,
+    without sorting. Only out-of-order input pays for a stable sort, which
+    keeps the last occurrence of a timestamp at the end of its run.
+
+    Args:
+        df: Raw frame with a Datetime column
+
+    Returns:
+        tuple: (normalized frame with a fresh RangeIndex, NormalizeStats)
+    """
+    df["Datetime"] = pd.to_datetime(df["Datetime"])
+    # asi8 works for naive and tz-aware columns (tz-aware ones order by the UTC instant)
+    stamps = np.asarray(df["Datetime"].array.asi8)
+    n = len(stamps)
+
+    # A row is out of order if an earlier row already had a later timestamp
+    out_of_order = int(np.count_nonzero(stamps[1:] < np.maximum.accumulate(stamps)[:-1])) if n else 0
+    order = None
+    if out_of_order:
+        order = np.argsort(stamps, kind="stable")
+        stamps = stamps[order]
+
+    # Keep a row unless the next row (in time order) has the same timestamp
+    keep = np.ones(n, dtype=bool)
+    np.not_equal(stamps[:-1], stamps[1:], out=keep[:-1])
+    duplicates = n - int(np.count_nonzero(keep))
+
+    if order is not None:
+        df = df.take(order[keep])
+    elif duplicates:
+        df = df[keep]
+    if order is not None or duplicates or not df.index.equals(pd.RangeIndex(len(df))):
+        df = df.reset_index(drop=True)
+
+    return df, NormalizeStats(n, out_of_order, duplicates, order is not None)
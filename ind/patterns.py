@@ -0,0 +1,140 @@
+# patterns.py
+
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import talib
+
+from .sweep import _map
+
+# Every TA-Lib candlestick pattern function (CDL2CROWS ... CDLXSIDEGAP3METHODS)
+PATTERNS: List[str] = sorted(talib.get_function_groups()["Pattern Recognition"])
+
+# TA-Lib pattern outputs (+-80, +-100, +-200) divided by this fit int8 exactly
+SIGNAL_SCALE = 10
+
+
+class PatternScan(NamedTuple):
+    """
+    Candlestick pattern signals for one ticker.
+
+    TA-Lib returns +-100 (+-200 for confirmed, +-80 for weaker variants) as
+    int32; signals here are that value divided by 10 as int8, which keeps
+    every level (positive bullish, negative bearish, 10 for a plain hit).
+    A dense scan holds an int8 matrix with one column per pattern; a sparse
+    scan holds only the hits as (row, pattern code, signal) arrays sorted by
+    row, where the pattern code indexes patterns.
+
+    Attributes:
+        patterns: Pattern function names, in column / code order
+        n_rows: Number of bars scanned
+        matrix: int8 array of shape (n_rows, len(patterns)), or None for a sparse scan
+        rows: Row of every hit (sparse scan), or None
+        codes: Pattern code of every hit (sparse scan), or None
+        signals: int8 signal of every hit (sparse scan), or None
+    """
+    patterns: List[str]
+    n_rows: int
+    matrix: Optional[np.ndarray] = None
+    rows: Optional[np.ndarray] = None
+    codes: Optional[np.ndarray] = None
+    signals: Optional[np.ndarray] = None
+
+    @property
+    def sparse(self) -> bool:
+        return self.matrix is None
+
+    def to_sparse(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Hits as (rows, codes, signals), sorted by row and then pattern."""
+        if self.sparse:
+            return self.rows, self.codes, self.signals
+        rows, codes = np.nonzero(self.matrix)
+        return rows.astype(np.int32), codes.astype(np.int16), self.matrix[rows, codes]
+
+    def to_dense(self) -> np.ndarray:
+        """int8 matrix of shape (n_rows, len(patterns)), zero where no pattern fired."""
+        if not self.sparse:
+            return self.matrix
+        matrix = np.zeros((self.n_rows, len(self.patterns)), dtype=np.int8)
+        matrix[self.rows, self.codes] = self.signals
+        return matrix
+
+    def to_frame(self, datetimes: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        One row per hit: Row (or Datetime), Pattern (Categorical over patterns) and Signal.
+
+        Args:
+            datetimes: Bar timestamps; replaces the row number with a Datetime column
+        """
+        rows, codes, signals = self.to_sparse()
+        first = {"Datetime": np.asarray(datetimes)[rows]} if datetimes is not None else {"Row": rows}
+        return pd.DataFrame({
+            **first,
+            "Pattern": pd.Categorical.from_codes(codes, categories=self.patterns),
+            "Signal": signals,
+        })
+
+
+def pattern_names(patterns: Optional[Iterable[str]] = None) -> List[str]:
+    """TA-Lib function names for the requested patterns (all by default); the CDL prefix is optional."""
+    if patterns is None:
+        return list(PATTERNS)
+    names = []
+    for pattern in patterns:
+        name = pattern.upper()
+        if not name.startswith("CDL"):
+            name = "CDL" + name
+        if name not in PATTERNS:
+            raise ValueError(f"Unsupported candlestick pattern: {pattern}")
+        names.append(name)
+    return names
+
+
+def scan_patterns(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                  patterns: Optional[Iterable[str]] = None, sparse: bool = False,
+                  workers: Optional[int] = None) -> PatternScan:
+    """
+    Run many TA-Lib candlestick pattern functions over the same OHLC arrays.
+
+    The arrays are passed to every function as they are (contiguous
+    float64, no per-pattern copies or frame columns). Each pattern's int32
+    output is narrowed to int8 right away; a sparse scan keeps only its
+    non-zero rows, so peak memory stays at one int32 column per worker.
+
+    Args:
+        open_, high, low, close: Price arrays
+        patterns: Pattern names (e.g. CDLHAMMER or HAMMER); all of PATTERNS by default
+        sparse: Return hits only instead of the dense int8 matrix
+        workers: Thread count for running patterns in parallel (None or 1 for serial)
+
+    Returns:
+        PatternScan
+    """
+    names = pattern_names(patterns)
+    n = len(close)
+
+    def run(name: str) -> np.ndarray:
+        return getattr(talib, name)(open_, high, low, close)
+
+    if not sparse:
+        matrix = np.empty((n, len(names)), dtype=np.int8, order="F")
+
+        def fill(item: Tuple[int, str]) -> None:
+            code, name = item
+            np.floor_divide(run(name), SIGNAL_SCALE, out=matrix[:, code], casting="unsafe")
+
+        _map(fill, list(enumerate(names)), workers)
+        return PatternScan(names, n, matrix=matrix)
+
+    def hits(name: str) -> Tuple[np.ndarray, np.ndarray]:
+        values = run(name)
+        rows = np.flatnonzero(values)
+        return rows.astype(np.int32), (values[rows] // SIGNAL_SCALE).astype(np.int8)
+
+    found = _map(hits, names, workers)
+    rows = np.concatenate([r for r, _ in found]) if found else np.empty(0, dtype=np.int32)
+    codes = np.repeat(np.arange(len(names), dtype=np.int16), [len(r) for r, _ in found])
+    signals = np.concatenate([s for _, s in found]) if found else np.empty(0, dtype=np.int8)
+    order = np.lexsort((codes, rows))
+    return PatternScan(names, n, rows=rows[order], codes=codes[order], signals=signals[order])
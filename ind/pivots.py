@@ -0,0 +1,167 @@
+# pivots.py
+
+import numpy as np
+from typing import Callable, Dict, Iterable, Tuple
+
+from .sessions import segment_bounds, segmented_extremes, session_ids
+
+# Period code -> calendar anchor understood by session_ids
+PIVOT_PERIODS = {"D": "session", "W": "week", "M": "month"}
+
+
+def _classic(h, l, c):
+    pp = (h + l + c) / 3
+    return {
+        "PP": pp,
+        "R1": 2 * pp - l, "S1": 2 * pp - h,
+        "R2": pp + (h - l), "S2": pp - (h - l),
+        "R3": h + 2 * (pp - l), "S3": l - 2 * (h - pp),
+    }
+
+
+def _fibonacci(h, l, c):
+    pp = (h + l + c) / 3
+    r = h - l
+    return {
+        "PP": pp,
+        "R1": pp + 0.382 * r, "S1": pp - 0.382 * r,
+        "R2": pp + 0.618 * r, "S2": pp - 0.618 * r,
+        "R3": pp + r, "S3": pp - r,
+    }
+
+
+def _camarilla(h, l, c):
+    r = (h - l) * 1.1
+    return {
+        "PP": (h + l + c) / 3,
+        "R1": c + r / 12, "S1": c - r / 12,
+        "R2": c + r / 6, "S2": c - r / 6,
+        "R3": c + r / 4, "S3": c - r / 4,
+        "R4": c + r / 2, "S4": c - r / 2,
+    }
+
+
+def _woodie(h, l, c):
+    pp = (h + l + 2 * c) / 4
+    return {
+        "PP": pp,
+        "R1": 2 * pp - l, "S1": 2 * pp - h,
+        "R2": pp + (h - l), "S2": pp - (h - l),
+    }
+
+
+# Formula name -> function of the previous period's (high, low, close)
+PIVOT_FORMULAS: Dict[str, Callable] = {
+    "classic": _classic,
+    "fibonacci": _fibonacci,
+    "camarilla": _camarilla,
+    "woodie": _woodie,
+}
+
+# Levels the original PIVOT_POINTS output, kept as plain PP/R1/... columns
+_LEGACY_LEVELS = ["PP", "R1", "S1", "R2", "S2"]
+
+
+def period_aggregates(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                      ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """High max, low min and last close of every period (one reduceat each), skipping NaN like groupby.agg."""
+    starts, _ = segment_bounds(ids)
+    # Last row with a finite close in each period (before the period start if there is none)
+    last = np.maximum.reduceat(np.where(np.isnan(close), -1, np.arange(len(close))), starts)
+    last_close = np.where(last >= starts, close[np.maximum(last, 0)], np.nan)
+    return np.fmax.reduceat(high, starts), np.fmin.reduceat(low, starts), last_close
+
+
+def _periods(periods: Iterable[str]):
+    for period in periods:
+        period = period.upper()
+        if period not in PIVOT_PERIODS:
+            raise ValueError(f"Unsupported pivot period: {period}")
+        yield period
+
+
+def _formulas(formulas: Iterable[str]):
+    formulas = [f.lower() for f in formulas]
+    for formula in formulas:
+        if formula not in PIVOT_FORMULAS:
+            raise ValueError(f"Unsupported pivot formula: {formula}")
+    return formulas
+
+
+def _column_name(formula: str, period: str, level: str):
+    """Output column of a level; None for classic daily levels the original output did not have."""
+    if formula == "classic" and period == "D":
+        return level if level in _LEGACY_LEVELS else None
+    return f"{formula.capitalize()}_{period}_{level}"
+
+
+def pivot_levels(high: np.ndarray, low: np.ndarray, close: np.ndarray, datetimes: np.ndarray,
+                 formulas: Iterable[str] = ("classic",), periods: Iterable[str] = ("D",)) -> Dict[str, np.ndarray]:
+    """
+    Pivot levels for several formulas and periods from shared period aggregates.
+
+    Each period's levels come from the previous period's high, low and
+    close and are broadcast onto the bars through the period-id array.
+    Classic daily pivots keep their original column names (PP, R1, S1,
+    R2, S2); everything else is named <Formula>_<Period>_<Level>, e.g.
+    Camarilla_W_R3.
+
+    Args:
+        high, low, close: Price arrays
+        datetimes: Sorted datetime64 values
+        formulas: Any of classic, fibonacci, camarilla, woodie
+        periods: Any of D (session), W (week), M (month)
+
+    Returns:
+        Dict of column name -> values per bar
+    """
+    formulas = _formulas(formulas)
+    columns: Dict[str, np.ndarray] = {}
+    if len(datetimes) == 0:
+        return columns
+    for period in _periods(periods):
+        ids = session_ids(datetimes, PIVOT_PERIODS[period])
+        h, l, c = period_aggregates(high, low, close, ids)
+        for formula in formulas:
+            for level, values in PIVOT_FORMULAS[formula](h, l, c).items():
+                name = _column_name(formula, period, level)
+                if name is None:
+                    continue
+                # Shift by one period so each period sees the previous period's levels
+                previous = np.concatenate(([np.nan], values[:-1]))
+                columns[name] = previous[ids]
+    return columns
+
+
+def developing_levels(high: np.ndarray, low: np.ndarray, close: np.ndarray, datetimes: np.ndarray,
+                      formulas: Iterable[str] = ("classic",), periods: Iterable[str] = ("D",)) -> Dict[str, np.ndarray]:
+    """
+    Developing pivot levels: the formulas applied to the current period so far.
+
+    Every bar uses the period's running high and low up to that bar and its
+    own close, so each value is known when the bar closes (no lookahead).
+    At a period's last bar the levels equal the ones pivot_levels gives
+    the next period. Columns are the pivot_levels names prefixed with
+    Dev_, e.g. Dev_PP or Dev_Camarilla_W_R3.
+
+    Args:
+        high, low, close: Price arrays
+        datetimes: Sorted datetime64 values
+        formulas: Any of classic, fibonacci, camarilla, woodie
+        periods: Any of D (session), W (week), M (month)
+
+    Returns:
+        Dict of column name -> values per bar
+    """
+    formulas = _formulas(formulas)
+    columns: Dict[str, np.ndarray] = {}
+    if len(datetimes) == 0:
+        return columns
+    for period in _periods(periods):
+        running_high, running_low = segmented_extremes(high, low, session_ids(datetimes, PIVOT_PERIODS[period]))
+        for formula in formulas:
+            for level, values in PIVOT_FORMULAS[formula](running_high, running_low, close).items():
+                name = _column_name(formula, period, level)
+                if name is not None:
+                    columns[f"Dev_{name}"] = values
+    return columns
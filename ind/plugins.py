@@ -0,0 +1,240 @@
+# plugins.py
+
+import sys
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from .rolling import RollingEngine
+from .sessions import segment_bounds
+
+# Entry point group scanned for third-party indicators
+ENTRY_POINT_GROUP = "ind.indicators"
+
+# Names handled by IndicatorProcessor.compute_indicator itself; plugins cannot shadow them
+BUILTIN_INDICATORS = frozenset({
+    "SMA", "EMA", "BOLLINGER", "VWAP", "PIVOT_POINTS", "SESSION_RANGE", "ATR", "RSI",
+    "MACD", "STOCH", "VOLUME_PROFILE", "FVG", "GAPS",
+})
+
+# Context fields a plugin can request as positional array inputs
+INPUTS = ("open", "high", "low", "close", "volume", "timestamps", "session_ids")
+
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    view = values.view()
+    view.flags.writeable = False
+    return view
+
+
+class IndicatorContext:
+    """
+    Read-only inputs and shared intermediates handed to custom indicators.
+
+    Price arrays are contiguous float64 views that cannot be written to,
+    timestamps are int64 nanoseconds. Session ids, session bounds and the
+    per-session aggregates (open, high, low, close, volume of every
+    calendar day) are computed once per loaded file and shared by every
+    plugin; rolling is the processor's cached RollingEngine.
+    """
+
+    __slots__ = ("open", "high", "low", "close", "volume", "timestamps", "session_ids", "session_starts",
+                 "session_ends", "session_open", "session_high", "session_low", "session_close",
+                 "session_volume", "rolling")
+
+    def __init__(self, arrays: Dict[str, np.ndarray], timestamps: np.ndarray, session_ids: np.ndarray,
+                 rolling: RollingEngine):
+        """
+        Args:
+            arrays: Price arrays keyed Open, High, Low, Close, Volume
+            timestamps: int64 nanoseconds
+            session_ids: Calendar-day session id of every row
+            rolling: Shared rolling-window engine
+        """
+        self.open = _read_only(arrays["Open"])
+        self.high = _read_only(arrays["High"])
+        self.low = _read_only(arrays["Low"])
+        self.close = _read_only(arrays["Close"])
+        self.volume = _read_only(arrays["Volume"])
+        self.timestamps = _read_only(timestamps)
+        self.session_ids = _read_only(session_ids)
+        self.rolling = rolling
+        starts, ends = segment_bounds(session_ids) if len(session_ids) else (np.empty(0, np.int64),) * 2
+        self.session_starts = _read_only(starts)
+        self.session_ends = _read_only(ends)
+        if len(starts):
+            self.session_open = _read_only(self.open[starts])
+            self.session_high = _read_only(np.fmax.reduceat(self.high, starts))
+            self.session_low = _read_only(np.fmin.reduceat(self.low, starts))
+            self.session_close = _read_only(self.close[ends])
+            self.session_volume = _read_only(np.add.reduceat(np.nan_to_num(self.volume), starts))
+        else:
+            self.session_open = self.session_high = self.session_low = self.close[:0]
+            self.session_close = self.session_volume = self.close[:0]
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+class IndicatorSpec(NamedTuple):
+    """
+    A registered custom indicator.
+
+    Attributes:
+        name: Upper-case indicator name used with add_indicator
+        func: The indicator function
+        inputs: Context fields passed positionally, or None to pass the IndicatorContext
+        outputs: Column names (str.format templates over the parameters, e.g. "OBV_{period}")
+        warmup: Bars of history needed before the first exact value (int or a function
+            of the parameters); None if the indicator works on whole sessions
+    """
+    name: str
+    func: Callable
+    inputs: Optional[Sequence[str]]
+    outputs: Optional[Sequence[str]]
+    warmup: Union[int, Callable[[dict], int], None]
+
+
+_REGISTRY: Dict[str, IndicatorSpec] = {}
+_entry_points_loaded = False
+
+
+def register_indicator(name: str, func: Optional[Callable] = None, inputs: Optional[Sequence[str]] = None,
+                       outputs: Optional[Sequence[str]] = None,
+                       warmup: Union[int, Callable[[dict], int], None] = None, replace: bool = False):
+    """
+    Register a custom indicator so add_indicator and add_indicators accept its name.
+
+    With inputs, func is called as func(*arrays, **params) with the named
+    context arrays (e.g. ("close", "volume")), which suits plain NumPy or
+    JIT-compiled kernels; otherwise it is called as func(context, **params).
+    It returns one array, a tuple of arrays (named by outputs) or a dict
+    of column name -> array; every column must have one value per bar.
+    Can be used as a decorator.
+
+    Args:
+        name: Indicator name (case-insensitive)
+        func: Indicator function (omit to use as a decorator)
+        inputs: Context fields to pass positionally, any of INPUTS
+        outputs: Output column names; defaults to the indicator name for a single array
+        warmup: Bars of history needed (int or function of the parameters) for latest()
+        replace: Allow replacing an existing registration
+
+    Returns:
+        func (so the decorator leaves the function usable)
+    """
+    if func is None:
+        return lambda f: register_indicator(name, f, inputs, outputs, warmup, replace)
+    key = name.upper()
+    if key in BUILTIN_INDICATORS:
+        raise ValueError(f"Cannot register {key}: it is a built-in indicator")
+    if key in _REGISTRY and not replace:
+        raise ValueError(f"Indicator {key} is already registered")
+    if inputs is not None:
+        unknown = [field for field in inputs if field not in INPUTS]
+        if unknown:
+            raise ValueError(f"Unsupported indicator inputs: {unknown}")
+    _REGISTRY[key] = IndicatorSpec(key, func, tuple(inputs) if inputs is not None else None,
+                                   tuple(outputs) if outputs is not None else None, warmup)
+    return func
+
+
+def unregister_indicator(name: str) -> None:
+    """Remove a custom indicator (no error if it is not registered)."""
+    _REGISTRY.pop(name.upper(), None)
+
+
+def _entry_points() -> list:
+    from importlib import metadata
+    found = metadata.entry_points()
+    if hasattr(found, "select"):
+        return list(found.select(group=ENTRY_POINT_GROUP))
+    return list(found.get(ENTRY_POINT_GROUP, []))
+
+
+def load_entry_points() -> List[str]:
+    """
+    Register the indicators advertised under the ind.indicators entry point group.
+
+    An entry point names an indicator function (registered under the entry
+    point's name) or a module that registers its indicators on import.
+    Failures are reported and skipped so one broken plugin does not stop
+    the others.
+
+    Returns:
+        Entry point names that resolved to a registered indicator
+    """
+    global _entry_points_loaded
+    _entry_points_loaded = True
+    added = []
+    for entry_point in _entry_points():
+        key = entry_point.name.upper()
+        try:
+            loaded = entry_point.load()
+            if callable(loaded) and key not in _REGISTRY:
+                register_indicator(key, loaded)
+        except Exception as e:
+            print(f"Error loading indicator plugin {entry_point.name}: {e}", file=sys.stderr)
+            continue
+        if key in _REGISTRY:
+            added.append(key)
+    return added
+
+
+def get_indicator(name: str) -> Optional[IndicatorSpec]:
+    """Registered indicator by name, scanning entry points on first use; None if unknown."""
+    if not _entry_points_loaded:
+        load_entry_points()
+    return _REGISTRY.get(name.upper())
+
+
+def registered_indicators() -> List[str]:
+    """Names of all registered custom indicators."""
+    if not _entry_points_loaded:
+        load_entry_points()
+    return sorted(_REGISTRY)
+
+
+def plugin_warmup(spec: IndicatorSpec, kwargs: dict) -> Optional[int]:
+    """Warm-up bars of a custom indicator for the given parameters (None = whole sessions)."""
+    return spec.warmup(kwargs) if callable(spec.warmup) else spec.warmup
+
+
+def _column_names(spec: IndicatorSpec, kwargs: dict, count: int) -> List[str]:
+    if spec.outputs is None:
+        if count == 1:
+            return [spec.name]
+        raise ValueError(f"Indicator {spec.name} returned {count} arrays but declares no output names")
+    if len(spec.outputs) != count:
+        raise ValueError(f"Indicator {spec.name} returned {count} arrays, expected {len(spec.outputs)}")
+    return [template.format(**kwargs) for template in spec.outputs]
+
+
+def compute_plugin(spec: IndicatorSpec, context: IndicatorContext, kwargs: dict) -> Dict[str, np.ndarray]:
+    """
+    Run a custom indicator and validate its output.
+
+    Returns:
+        Dict of column name -> values, one per bar
+    """
+    if spec.inputs is None:
+        result = spec.func(context, **kwargs)
+    else:
+        result = spec.func(*(getattr(context, field) for field in spec.inputs), **kwargs)
+
+    if isinstance(result, dict):
+        columns = dict(result)
+    elif isinstance(result, (tuple, list)):
+        columns = dict(zip(_column_names(spec, kwargs, len(result)), result))
+    else:
+        columns = {_column_names(spec, kwargs, 1)[0]: result}
+
+    n = len(context)
+    for name, values in columns.items():
+        if np.ndim(values) != 1 or len(values) != n:
+            raise ValueError(f"Indicator {spec.name} returned shape {np.shape(values)} for column {name}, "
+                             f"expected ({n},)")
+        if isinstance(values, np.ndarray) and not values.flags.writeable:
+            # A returned input view would keep the input read-only inside the frame
+            columns[name] = values.copy()
+    return columns
@@ -4,7 +4,50 @@ import pandas as pd
 import numpy as np
 import talib
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
+from .bars import BarSeries
+from .executor import run_indicators
+from .rolling import RollingEngine
+from .shm import SharedBars, compute_in_processes
+from . import sweep as _sweep
+from .sweep import SweepResult, parameter_grid
+from .resample import align_to_source, resample_ohlcv
+from .normalize import NormalizeStats, normalize_bars
+from .patterns import PatternScan, scan_patterns
+from .pivots import developing_levels, pivot_levels
+from .plugins import IndicatorContext, compute_plugin, get_indicator
+from .profile import DEFAULT_BINS, DEFAULT_ONLINE_TICK_SIZE, DEFAULT_VALUE_AREA, running_poc, volume_profile
+from .sessions import GAP_TYPES, anchored_vwaps, segmented_extremes, session_gaps, session_ids, vwap
+from .reader import COLUMN_NAMES, read_csv_full, read_csv_tail
+from .writer import append_csv, write_csv
+from .storage import DATABASE_FILES, is_database, read_frame, write_frame
+from . import dataset as _dataset
+from .tail import DEFAULT_TOLERANCE, HISTORY_ANCHOR, required_bars, session_anchor, warmup_bars
+
+# Columns kept as contiguous float64 arrays for the compute kernels
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Indicator set applied by add_default_indicators, as (name, kwargs) pairs
+DEFAULT_INDICATORS: List[Tuple[str, dict]] = [
+    # Original defaults
+    ("SMA", {"periods": [5, 10, 14, 20, 50, 100, 200]}),
+    ("EMA", {"periods": [5, 10, 14, 20, 50, 100, 200]}),
+    ("BOLLINGER", {"period": 20, "std_dev": 2}),
+    # New indicators
+    ("VWAP", {}),
+    ("PIVOT_POINTS", {}),
+    ("ATR", {}),
+    ("RSI", {}),
+    ("MACD", {}),
+    ("STOCH", {}),
+    ("VOLUME_PROFILE", {}),
+    ("FVG", {}),
+    ("GAPS", {}),
+]
+
+# Session indicators that broadcast a value only known at the session close;
+# add_indicators(online=True) evaluates them point-in-time instead
+ONLINE_INDICATORS = {"VOLUME_PROFILE", "GAPS"}
 
 class IndicatorProcessor:
     """Processes financial time-series data and generates technical indicators."""
@@ -12,200 +55,711 @@ class IndicatorProcessor:
     def __init__(self):
         self.df: Optional[pd.DataFrame] = None
         self.ticker: Optional[str] = None
+        self._rolling: Optional[RollingEngine] = None
+        self._session_ids: Optional[np.ndarray] = None
+        self._context: Optional[IndicatorContext] = None
+        self.timeframes: Dict[str, pd.DataFrame] = {}
+        self.load_stats: Optional[NormalizeStats] = None
+        self.arrays: Dict[str, np.ndarray] = {}
+        self.shared: Optional[SharedBars] = None
+        self.bars: Optional[BarSeries] = None
 
-    def load_data(self, file_path: str) -> None:
+    def load_data(self, file_path: str, last_n: Optional[int] = None, since=None,
+                  ticker: Optional[str] = None) -> None:
         """
-        Load financial data from a CSV file into a pandas DataFrame.
+        Load financial data from a CSV file (or a SQLite/DuckDB database) into a pandas DataFrame.
+
+        With last_n or since, the file is read backwards from the end and
+        only that region is parsed, so the cost follows the window size
+        rather than the file history. Both assume rows are appended in
+        chronological order and fall back to a full read when the tail
+        shows they are not (see reader.read_csv_tail); deduplication and
+        sorting still apply.
+        Counts of out-of-order and duplicate rows are kept in self.load_stats.
+        A .sqlite/.db/.duckdb path is read through its (ticker, Datetime)
+        index instead (see storage.read_frame).
         
         Args:
-            file_path: Path to the input CSV file
+            file_path: Path to the input CSV file or database
+            last_n: Only load the last N distinct bars
+            since: Only load bars at or after this timestamp
+            ticker: Ticker to read; required for a database
         """
         try:
+            if is_database(file_path):
+                if ticker is None:
+                    raise ValueError("A ticker is required to load from a database")
+                self.df, self.load_stats = normalize_bars(
+                    read_frame(file_path, ticker, columns=COLUMN_NAMES, start=since, last_n=last_n))
+                self.ticker = ticker
+                self._reset_state()
+                return
             # Read CSV, ignoring first column
-            self.df = pd.read_csv(file_path, usecols=range(1, 8))
-            self.df.columns = ["Datetime", "Adj Close", "Close", "High", "Low", "Open", "Volume"]
-            
-            # Convert Datetime to datetime type
-            self.df["Datetime"] = pd.to_datetime(self.df["Datetime"])
-            
-            # Remove duplicate datetimes
-            self.df = self.df.drop_duplicates(subset=["Datetime"], keep="last")
-            
-            # Sort by datetime
-            self.df = self.df.sort_values("Datetime").reset_index(drop=True)
+            if last_n is None and since is None:
+                self.df, self.load_stats = normalize_bars(read_csv_full(file_path))
+            elif last_n is None:
+                self.df, self.load_stats = normalize_bars(read_csv_tail(file_path, since=since))
+            else:
+                # Duplicates shrink the tail; widen the read until N distinct bars remain
+                lines = last_n
+                while True:
+                    raw = read_csv_tail(file_path, lines, since)
+                    self.df, self.load_stats = normalize_bars(raw)
+                    if len(self.df) >= last_n or len(raw) < lines or since is not None:
+                        break
+                    lines += 2 * (last_n - len(self.df))
+                self.df = self.df.iloc[-last_n:].reset_index(drop=True) if last_n else self.df.iloc[:0]
             
             # Extract ticker from filename
             self.ticker = Path(file_path).stem
+            self._reset_state()
             
         except Exception as e:
             raise ValueError(f"Failed to load {file_path}: {str(e)}")
 
-    def add_indicator(self, indicator: str, **kwargs) -> None:
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, ticker: Optional[str] = None) -> "IndicatorProcessor":
         """
-        Add a specific technical indicator to the DataFrame.
+        Create a processor over an already loaded, sorted and deduplicated frame.
+
+        Args:
+            df: Frame with Datetime and OHLCV columns
+            ticker: Optional ticker name
+        """
+        processor = cls()
+        processor.df = df.reset_index(drop=True)
+        processor.ticker = ticker
+        processor._reset_state()
+        return processor
+
+    @classmethod
+    def from_shared(cls, shared: SharedBars, ticker: Optional[str] = None) -> "IndicatorProcessor":
+        """
+        Create a processor over shared-memory bars without copying the prices.
+
+        The frame holds only Datetime; indicator kernels read the shared
+        arrays directly.
+
+        Args:
+            shared: Attached SharedBars
+            ticker: Optional ticker name
+        """
+        processor = cls.from_frame(shared.frame(), ticker)
+        arrays = shared.arrays
+        processor.bars = BarSeries(shared.datetimes, arrays["Open"], arrays["High"], arrays["Low"],
+                                   arrays["Close"], arrays["Volume"], ticker=ticker)
+        processor.arrays = processor.bars.arrays
+        # Keep the mapping alive for as long as the views are in use
+        processor.shared = shared
+        return processor
+
+    @classmethod
+    def from_bars(cls, bars: BarSeries) -> "IndicatorProcessor":
+        """
+        Create a processor that runs directly on a BarSeries, without a DataFrame.
+
+        Indicators are stored in bars.columns; call to_frame() (or
+        bars.to_frame()) to get a DataFrame when one is needed. Methods
+        that work on the frame itself (add_timeframes, latest) require
+        load_data or from_frame instead.
+
+        Args:
+            bars: Sorted, deduplicated bars
+        """
+        processor = cls()
+        processor.ticker = bars.ticker
+        processor.bars = bars
+        processor.arrays = bars.arrays
+        return processor
+
+    def to_frame(self) -> pd.DataFrame:
+        """The loaded frame, or a DataFrame built from the BarSeries and its computed columns."""
+        if self.df is not None:
+            return self.df
+        if self.bars is None:
+            raise ValueError("No data loaded. Call load_data first.")
+        return self.bars.to_frame()
+
+    def share(self) -> SharedBars:
+        """
+        Copy the loaded price arrays into a shared-memory block for worker processes.
+
+        The caller owns the block and must close() it (or use it as a context manager).
+        """
+        if self.bars is None:
+            raise ValueError("No data loaded. Call load_data first.")
+        return SharedBars.create(self.arrays, self.bars.datetimes)
+
+    def _reset_state(self) -> None:
+        """Drop per-file caches and snapshot the frame's prices as a BarSeries of contiguous float64 arrays."""
+        self._rolling = None
+        self._session_ids = None
+        self._context = None
+        self.shared = None
+        self.timeframes = {}
+        if all(column in self.df.columns for column in PRICE_COLUMNS):
+            self.bars = BarSeries.from_frame(self.df, self.ticker)
+            self.arrays = self.bars.arrays
+        else:
+            self.bars = None
+            self.arrays = {}
+
+    @property
+    def rolling(self) -> RollingEngine:
+        """Rolling-window engine over the loaded Close/High/Low, built on first use."""
+        if self.bars is None:
+            raise ValueError("No data loaded. Call load_data first.")
+        if self._rolling is None:
+            self._rolling = RollingEngine(self.arrays["Close"], self.arrays["High"], self.arrays["Low"])
+        return self._rolling
+
+    @property
+    def session_ids(self) -> np.ndarray:
+        """Calendar-day session id of every row, built on first use."""
+        if self.bars is None:
+            raise ValueError("No data loaded. Call load_data first.")
+        if self._session_ids is None:
+            self._session_ids = session_ids(self.bars.datetimes)
+        return self._session_ids
+
+    @property
+    def context(self) -> IndicatorContext:
+        """Read-only arrays and shared intermediates for custom indicators, built on first use."""
+        if self.bars is None:
+            raise ValueError("No data loaded. Call load_data first.")
+        if self._context is None:
+            self._context = IndicatorContext(self.arrays, self.bars.timestamps, self.session_ids, self.rolling)
+        return self._context
+
+    def compute_indicator(self, indicator: str, **kwargs) -> Dict[str, np.ndarray]:
+        """
+        Compute a technical indicator without modifying the DataFrame.
+
+        Only the read-only price arrays, Datetime and shared caches are
+        read, so independent indicators can be computed concurrently.
         
         Args:
             indicator: Name of the indicator (SMA, EMA, BOLLINGER, VWAP, etc.)
             **kwargs: Parameters for the indicator
+
+        Returns:
+            Dict of output column name -> values (one per row)
         """
-        if self.df is None:
+        if self.bars is None:
             raise ValueError("No data loaded. Call load_data first.")
         
         indicator = indicator.upper()
+        # TA-Lib gets the contiguous arrays directly (no pandas wrapper, no index alignment)
+        high, low, close = (self.arrays[c] for c in ("High", "Low", "Close"))
+        columns: Dict[str, np.ndarray] = {}
         
         if indicator == "SMA":
             periods = kwargs.get("periods", [20])
             for period in periods:
-                self.df[f"SMA_{period}"] = talib.SMA(self.df["Close"], timeperiod=period)
+                columns[f"SMA_{period}"] = self.rolling.sma(period)
         
         elif indicator == "EMA":
             periods = kwargs.get("periods", [20])
             for period in periods:
-                self.df[f"EMA_{period}"] = talib.EMA(self.df["Close"], timeperiod=period)
+                columns[f"EMA_{period}"] = talib.EMA(close, timeperiod=period)
         
         elif indicator == "BOLLINGER":
             period = kwargs.get("period", 20)
             std_dev = kwargs.get("std_dev", 2)
-            upper, middle, lower = talib.BBANDS(
-                self.df["Close"],
-                timeperiod=period,
-                nbdevup=std_dev,
-                nbdevdn=std_dev,
-                matype=0
-            )
-            self.df["BB_Upper"] = upper
-            self.df["BB_Middle"] = middle
-            self.df["BB_Lower"] = lower
+            upper, middle, lower = self.rolling.bbands(period, std_dev)
+            columns["BB_Upper"] = upper
+            columns["BB_Middle"] = middle
+            columns["BB_Lower"] = lower
         
         elif indicator == "VWAP":
-            # Intraday VWAP, reset daily
-            self.df['Date'] = self.df['Datetime'].dt.date
-            tp = (self.df['High'] + self.df['Low'] + self.df['Close']) / 3
-            self.df['TPV'] = tp * self.df['Volume']   # ✅ Added TPV column
-            self.df['cum_TPV'] = self.df.groupby('Date')['TPV'].cumsum()
-            self.df['cum_Vol'] = self.df.groupby('Date')['Volume'].cumsum()
-            self.df['VWAP'] = self.df['cum_TPV'] / self.df['cum_Vol']
+            # Intraday VWAP via a segmented cumulative sum; anchor="session" resets daily,
+            # "week" resets on Mondays, a list of timestamps gives one AVWAP column per anchor
+            anchor = kwargs.get("anchor", "session")
+            datetimes = self.bars.datetimes
+            volume = self.arrays["Volume"]
+            if anchor == "session":
+                columns["VWAP"] = vwap(high, low, close, volume, self.session_ids)
+            elif isinstance(anchor, str):
+                columns[f"VWAP_{anchor}"] = vwap(high, low, close, volume, session_ids(datetimes, anchor))
+            else:
+                columns.update(anchored_vwaps(high, low, close, volume, datetimes, anchor))
         
         elif indicator == "PIVOT_POINTS":
-            # Calculate daily pivot points based on previous day
-            self.df['Date'] = self.df['Datetime'].dt.date
-            daily = self.df.groupby('Date').agg({
-                'High': 'max',
-                'Low': 'min',
-                'Close': 'last'
-            }).reset_index()
-
-            # Calculate pivots
-            daily['PP'] = (daily['High'] + daily['Low'] + daily['Close']) / 3
-            daily['R1'] = 2 * daily['PP'] - daily['Low']
-            daily['S1'] = 2 * daily['PP'] - daily['High']
-            daily['R2'] = daily['PP'] + (daily['High'] - daily['Low'])
-            daily['S2'] = daily['PP'] - (daily['High'] - daily['Low'])
-
-            # Shift to apply previous day's pivots to the current day
-            daily[['PP','R1','S1','R2','S2']] = daily[['PP','R1','S1','R2','S2']].shift(1)
-
-            # Merge back to original df
-            self.df = self.df.merge(daily[['Date','PP','R1','S1','R2','S2']], on='Date', how='left')
+            # Pivot levels from the previous period, broadcast by period id; the
+            # default (classic, daily) produces the PP/R1/S1/R2/S2 columns.
+            # developing=True gives Dev_ levels from the current period so far
+            levels = developing_levels if kwargs.get("developing", False) else pivot_levels
+            columns.update(levels(
+                high, low, close, self.bars.datetimes,
+                formulas=kwargs.get("formulas", ["classic"]),
+                periods=kwargs.get("periods", ["D"]),
+            ))
+
+        elif indicator == "SESSION_RANGE":
+            # Running session high/low: the day's range as known at each bar
+            columns["Session_High"], columns["Session_Low"] = segmented_extremes(high, low, self.session_ids)
         
         elif indicator == "ATR":
-            period = kwargs.get("period", 14)
-            self.df[f"ATR_{period}"] = talib.ATR(self.df["High"], self.df["Low"], self.df["Close"], timeperiod=period)
+            periods = kwargs.get("periods", [kwargs.get("period", 14)])
+            table = _sweep.atr_table(high, low, close, periods, workers=kwargs.get("workers"))
+            for period in periods:
+                columns[f"ATR_{period}"] = table[period]
         
         elif indicator == "RSI":
             periods = kwargs.get("periods", [5, 14])
+            table = _sweep.rsi_table(close, periods, workers=kwargs.get("workers"))
             for period in periods:
-                self.df[f"RSI_{period}"] = talib.RSI(self.df["Close"], timeperiod=period)
+                columns[f"RSI_{period}"] = table[period]
         
         elif indicator == "MACD":
             fast = kwargs.get("fast", 5)
             slow = kwargs.get("slow", 13)
             signal = kwargs.get("signal", 9)
-            macd, signal_line, hist = talib.MACD(self.df["Close"], fastperiod=fast, slowperiod=slow, signalperiod=signal)
-            self.df[f"MACD_{fast}_{slow}_{signal}"] = macd
-            self.df[f"MACD_Signal_{fast}_{slow}_{signal}"] = signal_line
-            self.df[f"MACD_Hist_{fast}_{slow}_{signal}"] = hist
+            macd, signal_line, hist = talib.MACD(close, fastperiod=fast, slowperiod=slow, signalperiod=signal)
+            columns[f"MACD_{fast}_{slow}_{signal}"] = macd
+            columns[f"MACD_Signal_{fast}_{slow}_{signal}"] = signal_line
+            columns[f"MACD_Hist_{fast}_{slow}_{signal}"] = hist
         
         elif indicator == "STOCH":
             fastk = kwargs.get("fastk", 5)
             slowk = kwargs.get("slowk", 3)
             slowd = kwargs.get("slowd", 3)
-            slowk_line, slowd_line = talib.STOCH(self.df["High"], self.df["Low"], self.df["Close"],
-                                                 fastk_period=fastk, slowk_period=slowk, slowd_period=slowd)
-            self.df[f"Stoch_K_{fastk}_{slowk}_{slowd}"] = slowk_line
-            self.df[f"Stoch_D_{fastk}_{slowk}_{slowd}"] = slowd_line
+            slowk_line, slowd_line = self.rolling.stoch(fastk, slowk, slowd)
+            columns[f"Stoch_K_{fastk}_{slowk}_{slowd}"] = slowk_line
+            columns[f"Stoch_D_{fastk}_{slowk}_{slowd}"] = slowd_line
         
+        elif indicator == "VOLUME_PROFILE" and kwargs.get("online", False):
+            # Point-in-time POC on a fixed tick grid; the value area needs the whole session, so only POC
+            columns["POC"] = running_poc(
+                high, low, close, self.arrays["Volume"], self.session_ids,
+                tick_size=kwargs.get("tick_size") or DEFAULT_ONLINE_TICK_SIZE,
+                distribute=kwargs.get("distribute", False),
+            )
+
         elif indicator == "VOLUME_PROFILE":
-            # Simple daily POC (Price of Control)
-            self.df['Date'] = self.df['Datetime'].dt.date
-            def calculate_poc(group):
-                price_bins = pd.cut(group['Close'], bins=50)
-                # Set observed=True to adopt future default behavior and silence FutureWarning
-                vp = group.groupby(price_bins, observed=True)['Volume'].sum()
-                poc = vp.idxmax().mid if not vp.empty else np.nan
-                return poc
-            daily_poc = (
-                self.df.groupby('Date')[['Close','Volume']]
-                .apply(lambda g: calculate_poc(g))
-                .reset_index(name='POC')
+            # Per-session POC and value area from one flat (session, price level) histogram;
+            # the defaults (50 equal-width bins, volume at Close) reproduce the original POC
+            profile = volume_profile(
+                high, low, close, self.arrays["Volume"], self.session_ids,
+                tick_size=kwargs.get("tick_size"), bins=kwargs.get("bins", DEFAULT_BINS),
+                distribute=kwargs.get("distribute", False), value_area=kwargs.get("value_area", DEFAULT_VALUE_AREA),
             )
-            self.df = self.df.merge(daily_poc, on='Date', how='left')
+            ids = self.session_ids
+            columns["POC"] = profile.poc[ids]
+            columns["VAH"] = profile.vah[ids]
+            columns["VAL"] = profile.val[ids]
         
         elif indicator == "FVG":
             # Simple FVG detection (bullish and bearish)
-            self.df['FVG'] = 0.0
-            for i in range(2, len(self.df)):
-                if self.df.loc[i, 'Low'] > self.df.loc[i-2, 'High']:
-                    self.df.loc[i, 'FVG'] = self.df.loc[i, 'Low'] - self.df.loc[i-2, 'High']  # Bullish FVG
-                elif self.df.loc[i, 'High'] < self.df.loc[i-2, 'Low']:
-                    self.df.loc[i, 'FVG'] = self.df.loc[i, 'High'] - self.df.loc[i-2, 'Low']  # Bearish FVG (negative)
+            fvg = np.zeros(len(close))
+            bullish = low[2:] > high[:-2]
+            bearish = ~bullish & (high[2:] < low[:-2])
+            fvg[2:][bullish] = (low[2:] - high[:-2])[bullish]    # Bullish FVG
+            fvg[2:][bearish] = (high[2:] - low[:-2])[bearish]    # Bearish FVG (negative)
+            columns["FVG"] = fvg
         
         elif indicator == "GAPS":
-            # Daily gap detection
-            self.df['Date'] = self.df['Datetime'].dt.date
-            daily = self.df.groupby('Date').agg({'Open': 'first', 'Close': 'last'}).reset_index()
-            daily['Gap'] = daily['Open'] - daily['Close'].shift(1)
-            # Simple classification (example, can be enhanced)
-            daily['Gap_Type'] = 'Common'
-            daily.loc[(daily['Gap'].abs() > daily['Gap'].std()) & (daily['Gap'] > 0), 'Gap_Type'] = 'Breakaway'  # Example logic
-            # Merge back
-            self.df = self.df.merge(daily[['Date', 'Gap', 'Gap_Type']], on='Date', how='left')
+            # Daily gap detection, computed per session and broadcast by session id.
+            # Gap_Type is a Categorical over GAP_TYPES, or its int8 codes with codes=True;
+            # online=True classifies each gap against the gaps seen so far
+            ids = self.session_ids
+            gap, codes = session_gaps(self.arrays["Open"], close, ids, expanding=kwargs.get("online", False))
+            columns["Gap"] = gap[ids]
+            if kwargs.get("codes", False):
+                columns["Gap_Type"] = codes[ids]
+            else:
+                columns["Gap_Type"] = pd.Categorical.from_codes(codes[ids], categories=GAP_TYPES)
         
         else:
-            raise ValueError(f"Unsupported indicator: {indicator}")
+            # Custom indicators registered through ind.plugins (or entry points)
+            spec = get_indicator(indicator)
+            if spec is None:
+                raise ValueError(f"Unsupported indicator: {indicator}")
+            columns.update(compute_plugin(spec, self.context, kwargs))
+
+        return columns
+
+    def volume_profile_table(self, tick_size: Optional[float] = None, bins: int = DEFAULT_BINS,
+                             distribute: bool = False, value_area: float = DEFAULT_VALUE_AREA) -> pd.DataFrame:
+        """
+        Compact volume profile of every session: one row per price level that saw volume.
+
+        Args:
+            tick_size: Price level spacing; None for equal-width bins
+            bins: Equal-width bins per session (ignored with tick_size)
+            distribute: Spread each bar's volume across its High-Low range
+            value_area: Share of session volume in the value area
+
+        Returns:
+            DataFrame with Session (date), Price, Volume and Value_Area columns
+        """
+        if self.bars is None:
+            raise ValueError("No data loaded. Call load_data first.")
+        return volume_profile(
+            self.arrays["High"], self.arrays["Low"], self.arrays["Close"], self.arrays["Volume"], self.session_ids,
+            tick_size=tick_size, bins=bins, distribute=distribute, value_area=value_area,
+            table=True, datetimes=self.bars.datetimes,
+        ).table
 
-    def add_default_indicators(self) -> None:
-        """Add default set of indicators as specified in the PRD."""
-        # Original defaults
-        periods = [5, 10, 14, 20, 50, 100, 200]
-        self.add_indicator("SMA", periods=periods)
-        self.add_indicator("EMA", periods=periods)
-        self.add_indicator("BOLLINGER", period=20, std_dev=2)
+    def _assign(self, columns: Dict[str, np.ndarray]) -> None:
+        """Write computed columns into self.df, replacing existing ones and appending new ones in one step."""
+        if self.df is None:
+            # Running on a BarSeries: keep the arrays, build no frame
+            self.bars.columns.update(columns)
+            return
+        existing = {name: values for name, values in columns.items() if name in self.df.columns}
+        new = {name: values for name, values in columns.items() if name not in self.df.columns}
+        for name, values in existing.items():
+            self.df[name] = values
+        if new:
+            self.df = pd.concat([self.df, pd.DataFrame(new, index=self.df.index)], axis=1)
+
+    def add_indicator(self, indicator: str, **kwargs) -> None:
+        """
+        Add a specific technical indicator to the DataFrame.
         
-        # New indicators
-        self.add_indicator("VWAP")
-        self.add_indicator("PIVOT_POINTS")
-        self.add_indicator("ATR")
-        self.add_indicator("RSI")
-        self.add_indicator("MACD")
-        self.add_indicator("STOCH")
-        self.add_indicator("VOLUME_PROFILE")
-        self.add_indicator("FVG")
-        self.add_indicator("GAPS")
+        Args:
+            indicator: Name of the indicator (SMA, EMA, BOLLINGER, VWAP, etc.)
+            **kwargs: Parameters for the indicator
+        """
+        self._assign(self.compute_indicator(indicator, **kwargs))
 
-    def save_results(self, output_folder: str) -> None:
+    def sweep(self, indicator: str, workers: Optional[int] = None, dtype=np.float64, **grid) -> SweepResult:
         """
-        Save the processed DataFrame with indicators to a CSV file.
+        Evaluate an indicator over a parameter grid without modifying the DataFrame.
+
+        Intermediates are shared across combinations (one EMA per distinct
+        period for EMA/MACD, one mean/std per period for BOLLINGER, one
+        High/Low extreme per fastk for STOCH, one pass per distinct period
+        for RSI/ATR).
+
+        Args:
+            indicator: SMA, EMA, RSI, ATR, MACD, BOLLINGER or STOCH
+            workers: Thread count for parallel evaluation (None or 1 for serial)
+            dtype: Output dtype of the result matrix
+            **grid: Parameter axes, e.g. periods=[5, 10] for SMA/EMA/RSI/ATR;
+                fast=[...], slow=[...], signal=[...] or triples=[...] for MACD;
+                period=[...], std_dev=[...] or grid=[...] for BOLLINGER;
+                fastk=[...], slowk=[...], slowd=[...] or grid=[...] for STOCH
+
+        Returns:
+            SweepResult with a (rows x columns) value matrix
+        """
+        if self.bars is None:
+            raise ValueError("No data loaded. Call load_data first.")
+
+        indicator = indicator.upper()
+        close = self.rolling.close.values
+
+        if indicator == "SMA":
+            return _sweep.sweep_sma(close, grid.get("periods", [20]), engine=self.rolling, dtype=dtype)
+
+        elif indicator == "EMA":
+            return _sweep.sweep_ema(close, grid.get("periods", [20]), workers=workers, dtype=dtype)
+
+        elif indicator == "RSI":
+            return _sweep.sweep_rsi(close, grid.get("periods", [14]), workers=workers, dtype=dtype)
+
+        elif indicator == "ATR":
+            return _sweep.sweep_atr(self.arrays["High"], self.arrays["Low"], self.arrays["Close"],
+                                    grid.get("periods", [14]), workers=workers, dtype=dtype)
+
+        elif indicator == "MACD":
+            triples = grid.get("triples") or [
+                t for t in parameter_grid(grid.get("fast", [5]), grid.get("slow", [13]), grid.get("signal", [9]))
+                if t[0] < t[1]
+            ]
+            return _sweep.sweep_macd(close, triples, workers=workers, dtype=dtype)
+
+        elif indicator == "BOLLINGER":
+            combos = grid.get("grid") or parameter_grid(grid.get("period", [20]), grid.get("std_dev", [2]))
+            return _sweep.sweep_bollinger(close, combos, engine=self.rolling, dtype=dtype)
+
+        elif indicator == "STOCH":
+            combos = grid.get("grid") or parameter_grid(grid.get("fastk", [5]), grid.get("slowk", [3]), grid.get("slowd", [3]))
+            return _sweep.sweep_stoch(self.rolling, combos, dtype=dtype)
+
+        else:
+            raise ValueError(f"Unsupported sweep indicator: {indicator}")
+
+    def scan_patterns(self, patterns: Optional[List[str]] = None, sparse: bool = False,
+                      workers: Optional[int] = None) -> PatternScan:
+        """
+        Scan TA-Lib candlestick patterns without adding columns to the DataFrame.
+
+        Args:
+            patterns: Pattern names (e.g. CDLHAMMER or HAMMER); all CDL functions by default
+            sparse: Keep only the hits as (row, pattern, signal) arrays
+            workers: Thread count for running patterns in parallel (None or 1 for serial)
+
+        Returns:
+            PatternScan; to_frame(processor.bars.datetimes) lists the hits by timestamp
+        """
+        if self.bars is None:
+            raise ValueError("No data loaded. Call load_data first.")
+        return scan_patterns(self.arrays["Open"], self.arrays["High"], self.arrays["Low"], self.arrays["Close"],
+                             patterns=patterns, sparse=sparse, workers=workers)
+
+    def add_timeframes(self, timeframes: List[str], indicators: Optional[List[Tuple[str, dict]]] = None,
+                       align: bool = False) -> Dict[str, pd.DataFrame]:
+        """
+        Compute indicators on higher timeframes derived from the loaded bars.
+
+        Bars for every timeframe are built from the single loaded frame with
+        segmented reductions, so one parse serves all timeframes. Results
+        are kept in self.timeframes keyed by timeframe.
+
+        Args:
+            timeframes: Fixed-width bucket sizes, e.g. ["5min", "15min", "1h", "1D"]
+            indicators: (name, kwargs) pairs passed to add_indicator; the
+                default indicator set is used when omitted
+            align: Also add each timeframe's indicator columns to self.df,
+                suffixed with the timeframe (e.g. SMA_20_1h). Values appear
+                when the higher-timeframe bar closes and are forward-filled.
+
+        Returns:
+            Dict of timeframe -> indicator DataFrame
+        """
+        if self.df is None:
+            raise ValueError("No data loaded. Call load_data first.")
+
+        base_columns = set(COLUMN_NAMES) | {"Date"}
+        for timeframe in timeframes:
+            bars, starts = resample_ohlcv(self.df, timeframe)
+            child = IndicatorProcessor.from_frame(bars, self.ticker)
+            if indicators is None:
+                child.add_default_indicators()
+            else:
+                for name, kwargs in indicators:
+                    child.add_indicator(name, **kwargs)
+            self.timeframes[timeframe] = child.df
+
+            if align:
+                aligned = {}
+                for column in child.df.columns:
+                    if column in base_columns:
+                        continue
+                    values = child.df[column]
+                    if isinstance(values.dtype, pd.CategoricalDtype):
+                        # Align the codes so label columns (e.g. Gap_Type) stay Categorical
+                        codes = align_to_source(values.cat.codes.to_numpy(), starts, len(self.df), fill=-1)
+                        aligned[f"{column}_{timeframe}"] = pd.Categorical.from_codes(codes, dtype=values.dtype)
+                    else:
+                        aligned[f"{column}_{timeframe}"] = align_to_source(values.to_numpy(), starts, len(self.df))
+                self._assign(aligned)
+
+        return self.timeframes
+
+    def _previous_period_start(self, row: int, anchor: str = "session") -> int:
+        """First row of the period (session, week or month) before the one containing row (0 if none)."""
+        ids = self.session_ids if anchor == "session" else session_ids(self.bars.datetimes, anchor)
+        if ids[row] == 0:
+            return 0
+        return int(np.searchsorted(ids, ids[row] - 1, side="left"))
+
+    def _history_start(self, row: int, anchor) -> int:
+        """First row a session indicator needs for row: the previous period's start, or an anchor timestamp."""
+        if anchor == HISTORY_ANCHOR:
+            return 0
+        if isinstance(anchor, str):
+            return self._previous_period_start(row, anchor)
+        return min(row, int(np.searchsorted(self.bars.datetimes, np.datetime64(anchor), side="left")))
+
+    def _history_loaded(self, row: int, anchor) -> bool:
+        """Whether the loaded rows reach back far enough for _history_start(row, anchor)."""
+        if anchor == HISTORY_ANCHOR:
+            return False
+        if isinstance(anchor, str):
+            return self._previous_period_start(row, anchor) > 0
+        return self.bars.datetimes[0] <= np.datetime64(anchor)
+
+    def latest(self, k: int = 1, indicators: Optional[List[Tuple[str, dict]]] = None,
+               tolerance: float = DEFAULT_TOLERANCE) -> pd.DataFrame:
+        """
+        Evaluate only the last k values of each indicator.
+
+        Each indicator runs on the shortest trailing slice that reproduces
+        its last k values: its lookback for windowed indicators, enough bars
+        for EMA/RSI/ATR/MACD recursions to converge within tolerance (see
+        tail.recursive_warmup), and the previous plus current sessions for
+        VWAP, PIVOT_POINTS and VOLUME_PROFILE (the previous week or month
+        for weekly or monthly pivots and VWAP, from the earliest anchor for
+        anchored VWAP; see tail.session_anchor). GAPS runs on all loaded
+        rows, since each gap is classified against the dispersion of every
+        gap; its labels match a full run when the whole file is loaded.
+
+        Args:
+            k: Number of trailing rows to return
+            indicators: (name, kwargs) pairs; defaults to the default set
+            tolerance: Residual weight allowed for truncated EMA-family history
+
+        Returns:
+            DataFrame with Datetime and the indicator columns for the last k rows
+        """
+        if self.df is None:
+            raise ValueError("No data loaded. Call load_data first.")
+
+        indicators = DEFAULT_INDICATORS if indicators is None else indicators
+        n = len(self.df)
+        k = max(1, min(k, n))
+        base_columns = set(COLUMN_NAMES) | {"Date"}
+
+        parts = [self.df["Datetime"].iloc[n - k:].reset_index(drop=True)]
+        for name, kwargs in indicators:
+            warmup = warmup_bars(name, kwargs, tolerance)
+            if warmup is None:
+                start = self._history_start(n - k, session_anchor(name, kwargs))
+            else:
+                start = max(0, n - k - warmup)
+            child = IndicatorProcessor.from_frame(self.df.iloc[start:][COLUMN_NAMES], self.ticker)
+            child.add_indicator(name, **kwargs)
+            columns = [c for c in child.df.columns if c not in base_columns]
+            parts.append(child.df[columns].iloc[-k:].reset_index(drop=True))
+        return pd.concat(parts, axis=1)
+
+    def load_latest(self, file_path: str, k: int = 1, indicators: Optional[List[Tuple[str, dict]]] = None,
+                    tolerance: float = DEFAULT_TOLERANCE) -> None:
+        """
+        Load just enough of the file tail to evaluate latest(k, indicators, tolerance).
+
+        Session-based indicators need the whole previous session (week or
+        month for weekly or monthly pivots and VWAP, the anchor for anchored
+        VWAP); the tail read is doubled until it starts before that point or
+        covers the file. GAPS needs every session, so it loads the whole file.
+
+        Args:
+            file_path: Path to the input CSV file
+            k: Number of trailing rows that will be evaluated
+            indicators: (name, kwargs) pairs; defaults to the default set
+            tolerance: Residual weight allowed for truncated EMA-family history
+        """
+        indicators = DEFAULT_INDICATORS if indicators is None else indicators
+        rows, _ = required_bars(indicators, k, tolerance)
+        anchors = [session_anchor(name, kwargs) for name, kwargs in indicators
+                   if warmup_bars(name, kwargs, tolerance) is None]
+        if HISTORY_ANCHOR in anchors:
+            self.load_data(file_path)
+            return
+        while True:
+            self.load_data(file_path, last_n=rows)
+            if len(self.df) < rows or not anchors:
+                return
+            n = len(self.df)
+            if all(self._history_loaded(n - min(k, n), anchor) for anchor in anchors):
+                return
+            rows *= 2
+
+    def add_indicators(self, indicators: List[Tuple[str, dict]], threads: Optional[int] = None,
+                       processes: Optional[int] = None, online: bool = False) -> None:
+        """
+        Add several indicators, optionally computing them in parallel.
+
+        Args:
+            indicators: (name, kwargs) pairs
+            threads: Worker threads for independent indicator families (None or 1 for serial)
+            processes: Worker processes attached to a shared-memory copy of the
+                price arrays; takes precedence over threads when > 1
+            online: Evaluate ONLINE_INDICATORS point-in-time (no lookahead), for backtests
+        """
+        if self.bars is None:
+            raise ValueError("No data loaded. Call load_data first.")
+        if online:
+            indicators = [(name, {**kwargs, "online": True}) if name.upper() in ONLINE_INDICATORS else (name, kwargs)
+                          for name, kwargs in indicators]
+        if processes and processes > 1:
+            with self.share() as shared:
+                self._assign(compute_in_processes(shared, indicators, processes))
+            return
+        # Build shared caches up front so workers only read them
+        self.rolling
+        self.session_ids
+        if any(get_indicator(name) is not None for name, _ in indicators):
+            self.context
+        self._assign(run_indicators(self.compute_indicator, indicators, threads))
+
+    def add_default_indicators(self, threads: Optional[int] = None, processes: Optional[int] = None,
+                               online: bool = False) -> None:
+        """
+        Add default set of indicators as specified in the PRD.
+
+        Args:
+            threads: Worker threads for independent indicator families (None or 1 for serial)
+            processes: Worker processes sharing the price arrays through shared memory
+            online: Point-in-time session indicators (running POC, expanding gap types)
+        """
+        self.add_indicators(DEFAULT_INDICATORS, threads, processes, online)
+
+    def save_results(self, output_folder: str, fmt: str = "csv", float_format: Union[int, str, None] = None,
+                     compression: Optional[str] = None, append: bool = False, partition: str = "year") -> None:
+        """
+        Save the processed DataFrame with indicators to a CSV or Parquet file, a dataset or a database.
+
+        Parquet keeps Categorical label columns (e.g. Gap_Type) dictionary
+        encoded; it requires pyarrow. CSV is written in row blocks (see
+        writer.write_csv). With append, only rows after the last timestamp
+        already in the output are written, and the file is rewritten from
+        the first changed chunk only when earlier rows changed (see
+        writer.append_csv). "sqlite" and "duckdb" upsert the rows into
+        indicators.sqlite / indicators.duckdb in the output folder, keyed
+        on (ticker, Datetime) (see storage.write_frame). "dataset" writes
+        into a Hive-partitioned Parquet dataset rooted at the output folder
+        (see dataset.write_dataset and read_dataset).
         
         Args:
             output_folder: Path to the output folder
+            fmt: "csv", "parquet", "dataset", "sqlite" or "duckdb" (requires duckdb)
+            float_format: CSV only; decimals to keep (e.g. 4) or a printf-style format
+            compression: CSV only; None, "gzip" or "zstd"
+            append: CSV only; append new rows to a previous output
+            partition: Dataset only; "year" or "month" partitions below the ticker
         """
-        if self.df is None or self.ticker is None:
+        if (self.df is None and self.bars is None) or self.ticker is None:
             raise ValueError("No data loaded or ticker not set.")
+        df = self.to_frame()
+        if fmt not in ("csv", "parquet", "dataset") and fmt not in DATABASE_FILES:
+            raise ValueError(f"Unsupported output format: {fmt}")
+        if append and fmt != "csv":
+            raise ValueError("Append mode is only supported for CSV output")
         
-        output_path = Path(output_folder) / f"{self.ticker}.csv"
+        if fmt in DATABASE_FILES:
+            output_path = Path(output_folder) / DATABASE_FILES[fmt]
+        elif fmt == "dataset":
+            output_path = Path(output_folder)
+        else:
+            output_path = Path(output_folder) / f"{self.ticker}.{fmt}"
         try:
-            self.df.to_csv(output_path, index=False)
+            if fmt in DATABASE_FILES:
+                write_frame(output_path, self.ticker, df, backend=fmt)
+            elif fmt == "dataset":
+                _dataset.write_dataset(df, output_path, self.ticker, partition=partition)
+            elif fmt == "parquet":
+                df.to_parquet(output_path, index=False)
+            elif append:
+                append_csv(df, output_path, float_format=float_format, compression=compression)
+            else:
+                write_csv(df, output_path, float_format=float_format, compression=compression)
         except Exception as e:
             raise ValueError(f"Failed to save results to {output_path}: {str(e)}")
+
+    @staticmethod
+    def read_dataset(root: str, tickers: Optional[List[str]] = None, start=None, end=None,
+                     columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load a date range for several tickers from a dataset written with fmt="dataset".
+
+        Only the matching ticker/year partitions and the row groups whose
+        Datetime statistics overlap the range are read, and only the
+        requested columns are decoded.
+
+        Args:
+            root: Dataset root (the output folder)
+            tickers: Tickers to load (all by default)
+            start: Only rows at or after this timestamp
+            end: Only rows at or before this timestamp
+            columns: Indicator columns to load (all by default)
+
+        Returns:
+            Frame with ticker, Datetime and the requested columns, sorted by ticker and Datetime
+        """
+        return _dataset.read_dataset(root, tickers=tickers, start=start, end=end, columns=columns)
         
\ No newline at end of file
@@ -0,0 +1,334 @@
+# profile.py
+
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .sessions import segment_bounds
+
+# Share of session volume inside the value area
+DEFAULT_VALUE_AREA = 0.70
+
+# Equal-width bins per session when no tick size is given
+DEFAULT_BINS = 50
+
+# Price grid of the running (point-in-time) POC; equal-width bins would need the whole session's range
+DEFAULT_ONLINE_TICK_SIZE = 0.01
+
+
+class VolumeProfile(NamedTuple):
+    """
+    Per-session volume profile levels.
+
+    Attributes:
+        poc: Price level with the most volume, one per session
+        vah: Highest price level of the value area
+        val: Lowest price level of the value area
+        table: Optional compact profile (Session, Price, Volume, Value_Area),
+            one row per price level that saw volume
+    """
+    poc: np.ndarray
+    vah: np.ndarray
+    val: np.ndarray
+    table: Optional[pd.DataFrame]
+
+
+def _equal_width_edges(mn: np.ndarray, mx: np.ndarray, bins: int) -> np.ndarray:
+    """Bin edges per session, built exactly as pd.cut(values, bins) builds them."""
+    flat = mn == mx
+    mn = np.where(flat, mn - np.where(mn != 0, 0.001 * np.abs(mn), 0.001), mn)
+    mx_adj = np.where(flat, mx + np.where(mx != 0, 0.001 * np.abs(mx), 0.001), mx)
+    step = (mx_adj - mn) / bins
+    edges = np.arange(bins + 1) * step[:, None] + mn[:, None]
+    edges[:, -1] = mx_adj
+    # Widen the first bin by 0.1% of the range so the minimum falls inside (a, b]
+    edges[~flat, 0] -= (mx_adj - mn)[~flat] * 0.001
+    return edges
+
+
+def _round_frac(values: np.ndarray, precision: np.ndarray) -> np.ndarray:
+    """Vectorized pandas _round_frac: round to precision decimals, or significant digits below 1."""
+    frac, whole = np.modf(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        digits = np.where(whole == 0, -np.floor(np.log10(np.abs(frac))) - 1 + precision, precision)
+    digits = np.where(np.isfinite(digits), digits, 0).astype(np.int64)
+    out = values.copy()
+    for d in np.unique(digits):
+        mask = (digits == d) & np.isfinite(values) & (values != 0)
+        out[mask] = np.around(values[mask], int(d))
+    return out
+
+
+def _label_edges(edges: np.ndarray, precision: int = 3) -> np.ndarray:
+    """
+    Edges as shown in pd.cut interval labels.
+
+    pandas rounds the breaks to `precision` decimals, raising the
+    precision per session until the rounded breaks are distinct; the
+    original POC was the midpoint of those labels, so levels use them too.
+    """
+    rows = np.arange(len(edges))
+    labels = np.empty_like(edges)
+    for p in range(precision, 20):
+        if not len(rows):
+            break
+        rounded = _round_frac(edges[rows], np.full((len(rows), 1), p))
+        distinct = np.all(np.diff(rounded, axis=1) != 0, axis=1)
+        labels[rows[distinct]] = rounded[distinct]
+        rows = rows[~distinct]
+    labels[rows] = edges[rows]
+    return labels
+
+
+def _equal_width_bin(values: np.ndarray, sessions: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Right-closed bin of every value within its session's edges (as pd.cut labels them)."""
+    bins = edges.shape[1] - 1
+    left = edges[sessions, 0]
+    step = (edges[sessions, -1] - left) / bins
+    with np.errstate(invalid="ignore", divide="ignore"):
+        k = np.clip(np.ceil((values - left) / step) - 1, 0, bins - 1).astype(np.int64)
+    # The estimate can be one off at an edge; settle it against the exact edges
+    for _ in range(2):
+        k = np.where((values <= edges[sessions, k]) & (k > 0), k - 1, k)
+        k = np.where((values > edges[sessions, k + 1]) & (k < bins - 1), k + 1, k)
+    return k
+
+
+def _segment_first_argmax(values: np.ndarray, offsets: np.ndarray, owner: np.ndarray) -> np.ndarray:
+    """Index of the first maximum of every segment of a flat array."""
+    seg_max = np.maximum.reduceat(values, offsets[:-1])
+    hits = np.flatnonzero(values == seg_max[owner])
+    first = np.ones(len(hits), dtype=bool)
+    first[1:] = owner[hits[1:]] != owner[hits[:-1]]
+    return hits[first]
+
+
+def _value_area(hist: np.ndarray, offsets: np.ndarray, poc: np.ndarray,
+                share: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Grow each session's value area from the POC until it holds share of the volume.
+
+    At every step the neighbouring level with more volume (above on ties)
+    is added. All sessions advance together; each loop iteration is one
+    vectorized step over the sessions that are still growing.
+    """
+    starts, stops = offsets[:-1], offsets[1:]
+    lo = poc.copy()
+    hi = poc.copy()
+    acc = hist[poc].copy()
+    target = share * np.add.reduceat(hist, starts)
+    active = np.flatnonzero((acc < target) & ((lo > starts) | (hi < stops - 1)))
+    padded = np.append(hist, -1.0)
+    none = len(hist)
+    while len(active):
+        a_lo, a_hi = lo[active], hi[active]
+        up_idx = np.where(a_hi + 1 < stops[active], a_hi + 1, none)
+        down_idx = np.where(a_lo > starts[active], a_lo - 1, none)
+        up, down = padded[up_idx], padded[down_idx]
+        take_up = up >= down
+        hi[active] = np.where(take_up, up_idx, a_hi)
+        lo[active] = np.where(take_up, a_lo, down_idx)
+        acc[active] += np.where(take_up, up, down)
+        active = active[(acc[active] < target[active])
+                        & ((lo[active] > starts[active]) | (hi[active] < stops[active] - 1))]
+    return lo, hi
+
+
+def volume_profile(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, ids: np.ndarray,
+                   tick_size: Optional[float] = None, bins: int = DEFAULT_BINS, distribute: bool = False,
+                   value_area: float = DEFAULT_VALUE_AREA, table: bool = False,
+                   datetimes: Optional[np.ndarray] = None) -> VolumeProfile:
+    """
+    Volume profile of every session from one flat histogram.
+
+    Every (session, price level) pair gets a slot in a single flat array,
+    so all sessions are histogrammed with one np.bincount. Without a tick
+    size each session gets `bins` equal-width bins over its range, built
+    exactly like pd.cut, and levels are the midpoints of pd.cut's interval
+    labels (so the default POC matches the original groupby); with a tick size
+    levels are multiples of the tick. By default a bar's volume goes to
+    its close; with distribute it is spread evenly over the levels between
+    its low and high (a difference array, so the cost does not grow with
+    the bar's range).
+
+    Args:
+        high, low, close, volume: Price and volume arrays
+        ids: Session ids from session_ids (0..n_sessions-1, non-decreasing)
+        tick_size: Price level spacing; None for equal-width bins
+        bins: Equal-width bins per session (ignored with tick_size)
+        distribute: Spread each bar's volume across its High-Low range
+        value_area: Share of session volume in the value area (e.g. 0.70)
+        table: Also return the compact per-session profile
+        datetimes: Bar timestamps, used to label sessions (by date) in the table
+
+    Returns:
+        VolumeProfile with per-session POC, VAH and VAL
+    """
+    if len(ids) == 0:
+        empty = np.empty(0)
+        return VolumeProfile(empty, empty, empty, None)
+    starts, _ = segment_bounds(ids)
+    n_sessions = len(starts)
+    price_low, price_high = (low, high) if distribute else (close, close)
+    # Bars without a finite price are left out (as pd.cut leaves NaN outside every bin)
+    valid = np.isfinite(price_low) & np.isfinite(price_high)
+    session_low = np.fmin.reduceat(np.where(valid, price_low, np.nan), starts)
+    session_high = np.fmax.reduceat(np.where(valid, price_high, np.nan), starts)
+    empty = np.isnan(session_low)
+    session_low[empty] = session_high[empty] = 0.0
+    volume = np.nan_to_num(np.asarray(volume, dtype=np.float64))[valid]
+    price_low, price_high, ids = price_low[valid], price_high[valid], ids[valid]
+
+    # Local level index of every bar (low and high ends) and the number of levels per session
+    if tick_size is None:
+        edges = _equal_width_edges(session_low, session_high, bins)
+        k_low = _equal_width_bin(price_low, ids, edges)
+        k_high = k_low if not distribute else _equal_width_bin(price_high, ids, edges)
+        counts = np.full(n_sessions, bins, dtype=np.int64)
+    else:
+        if tick_size <= 0:
+            raise ValueError(f"tick_size must be positive, got {tick_size}")
+        level_low = np.round(price_low / tick_size).astype(np.int64)
+        level_high = level_low if not distribute else np.round(price_high / tick_size).astype(np.int64)
+        # Rounding is monotonic, so the session's level range comes from its price range
+        base = np.round(session_low / tick_size).astype(np.int64)
+        counts = np.round(session_high / tick_size).astype(np.int64) - base + 1
+        k_low = level_low - base[ids]
+        k_high = level_high - base[ids]
+
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    total = int(offsets[-1])
+    key_low = offsets[ids] + k_low
+    if distribute:
+        key_high = offsets[ids] + k_high
+        share = volume / (key_high - key_low + 1)
+        # Difference array: +share at the low level, -share past the high level
+        diff = np.bincount(key_low, share, total + 1) - np.bincount(key_high + 1, share, total + 1)
+        hist = np.cumsum(diff)[:total]
+        np.maximum(hist, 0.0, out=hist)
+        touched = np.cumsum(np.bincount(key_low, minlength=total + 1)
+                            - np.bincount(key_high + 1, minlength=total + 1))[:total] > 0
+    else:
+        hist = np.bincount(key_low, volume, total)
+        touched = np.bincount(key_low, minlength=total) > 0
+
+    owner = np.repeat(np.arange(n_sessions), counts)
+    local = np.arange(total) - offsets[owner]
+    if tick_size is None:
+        labels = _label_edges(edges)
+        levels = 0.5 * (labels[owner, local] + labels[owner, local + 1])
+    else:
+        levels = (base[owner] + local) * tick_size
+
+    # Levels no bar touched never win (pandas' observed=True semantics)
+    poc = _segment_first_argmax(np.where(touched, hist, -np.inf), offsets, owner)
+    lo, hi = _value_area(hist, offsets, poc, value_area)
+
+    profile_table = None
+    if table:
+        slots = np.arange(total)
+        in_area = (slots >= lo[owner]) & (slots <= hi[owner])
+        keep = touched
+        labels = np.asarray(datetimes)[starts].astype("datetime64[D]") if datetimes is not None else np.arange(n_sessions)
+        profile_table = pd.DataFrame({
+            "Session": labels[owner[keep]],
+            "Price": levels[keep],
+            "Volume": hist[keep],
+            "Value_Area": in_area[keep],
+        })
+    # Sessions without a single finite price have no profile
+    return VolumeProfile(np.where(empty, np.nan, levels[poc]), np.where(empty, np.nan, levels[hi]),
+                         np.where(empty, np.nan, levels[lo]), profile_table)
+
+
+def _running_poc_at_close(level: np.ndarray, volume: np.ndarray, ids: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Running POC level with all of a bar's volume at its close level.
+
+    A level's volume only grows, so the POC after bar t is the level of the
+    largest (level volume, -level) pair seen so far in the session. The
+    level volume after every bar is a cumulative sum per (session, level),
+    the pairs are ranked once, and the running maximum of the rank (offset
+    per session so one global accumulate restarts at every session) picks
+    the POC. Ties go to the lower level, as in volume_profile.
+    """
+    n = len(level)
+    order = np.lexsort((np.arange(n), level, ids))
+    group = np.empty(n, dtype=bool)
+    if n:
+        group[0] = True
+        group[1:] = (ids[order][1:] != ids[order][:-1]) | (level[order][1:] != level[order][:-1])
+    sorted_volume = volume[order]
+    total = np.cumsum(sorted_volume)
+    base = (total - sorted_volume)[group]
+    level_volume = np.empty(n)
+    level_volume[order] = total - base[np.cumsum(group) - 1]
+
+    rank = np.empty(n, dtype=np.int64)
+    by_pair = np.lexsort((-level, level_volume))
+    rank[by_pair] = np.arange(n)
+    rank[~valid] = -1
+    offset = ids * (n + 1)
+    best = np.maximum.accumulate(rank + offset) - offset
+    poc = np.full(n, -1, dtype=np.int64)
+    found = best >= 0
+    poc[found] = level[by_pair[best[found]]]
+    return poc
+
+
+def running_poc(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, ids: np.ndarray,
+                tick_size: float = DEFAULT_ONLINE_TICK_SIZE, distribute: bool = False) -> np.ndarray:
+    """
+    Point-in-time POC: the session's POC using only the bars up to each bar.
+
+    Levels are multiples of tick_size, so they do not depend on the rest of
+    the session, and the POC at a session's last bar equals volume_profile's
+    POC for the same tick size. Volume at the close is handled fully
+    vectorized in O(n log n); with distribute, bars are added one at a time
+    and each costs O(1) plus the number of levels in its High-Low range.
+
+    Args:
+        high, low, close, volume: Price and volume arrays
+        ids: Session ids from session_ids
+        tick_size: Price level spacing
+        distribute: Spread each bar's volume across its High-Low range
+
+    Returns:
+        POC per bar (NaN until the session has a bar with a valid price)
+    """
+    if tick_size is None or tick_size <= 0:
+        raise ValueError(f"tick_size must be positive, got {tick_size}")
+    volume = np.nan_to_num(np.asarray(volume, dtype=np.float64))
+    price_low, price_high = (low, high) if distribute else (close, close)
+    valid = np.isfinite(price_low) & np.isfinite(price_high)
+    level_low = np.round(np.where(valid, price_low, 0.0) / tick_size).astype(np.int64)
+    level_high = np.round(np.where(valid, price_high, 0.0) / tick_size).astype(np.int64)
+
+    volume = np.where(valid, volume, 0.0)
+    if not distribute:
+        level = _running_poc_at_close(level_low, volume, ids, valid)
+        return np.where(level >= 0, level * tick_size, np.nan) if len(level) else np.empty(0)
+
+    poc = np.full(len(ids), np.nan)
+    starts, ends = segment_bounds(ids)
+    for start, end in zip(starts, ends + 1):
+        rows = np.flatnonzero(valid[start:end]) + start
+        if not len(rows):
+            continue
+        base = level_low[rows].min()
+        hist = np.zeros(level_high[rows].max() - base + 1)
+        best = -1
+        for row in rows:
+            a, b = level_low[row] - base, level_high[row] - base + 1
+            hist[a:b] += volume[row] / (b - a)
+            # Only the levels in the bar's range grew; the first (lowest) maximum wins ties
+            j = a + int(hist[a:b].argmax())
+            if best < 0 or hist[j] > hist[best] or (hist[j] == hist[best] and j < best):
+                best = j
+            poc[row] = (base + best) * tick_size
+        # Bars without a valid price keep the POC of the previous bar
+        segment = poc[start:end]
+        filled = np.maximum.accumulate(np.where(np.isnan(segment), -1, np.arange(len(segment))))
+        poc[start:end] = np.where(filled >= 0, segment[np.maximum(filled, 0)], np.nan)
+    return poc
@@ -0,0 +1,142 @@
+# reader.py
+
+import io
+import os
+from typing import Optional
+
+import pandas as pd
+
+# Position-based input layout: column 1 is ignored, columns 2-8 are kept
+COLUMN_NAMES = ["Datetime", "Adj Close", "Close", "High", "Low", "Open", "Volume"]
+
+_CHUNK_SIZE = 1 << 16
+
+
+def _line_datetime(line: bytes) -> Optional[pd.Timestamp]:
+    """Parse the Datetime field (second column) of a raw CSV line, or None if unparseable."""
+    fields = line.split(b",")
+    if len(fields) < 2:
+        return None
+    try:
+        return pd.Timestamp(fields[1].strip().strip(b'"').decode("utf-8"))
+    except ValueError:
+        return None
+
+
+def _match_tz(since: pd.Timestamp, tz) -> pd.Timestamp:
+    """since in the time zone of the data: a naive since is local time in tz, naive data drops since's offset."""
+    if tz is None:
+        return since.tz_localize(None) if since.tz is not None else since
+    return since.tz_localize(tz) if since.tz is None else since.tz_convert(tz)
+
+
+def _first_datetime(file_path: str) -> Optional[pd.Timestamp]:
+    """Datetime of the first data row, or None if the file has none."""
+    with open(file_path, "rb") as f:
+        f.readline()
+        return _line_datetime(f.readline())
+
+
+def read_tail_text(file_path: str, n_lines: Optional[int] = None, since=None,
+                   chunk_size: int = _CHUNK_SIZE) -> str:
+    """
+    Return the header line plus the trailing data lines of a text file.
+
+    The file is read backwards in fixed-size chunks from the end, so the
+    cost is proportional to the tail size rather than the file size.
+    Reading stops once n_lines complete lines are buffered, or once the
+    earliest complete buffered line is older than since. The since stop
+    assumes rows are appended in chronological order.
+
+    Args:
+        file_path: Path to the CSV file
+        n_lines: Number of trailing data lines to keep
+        since: Keep every line from the last one older than this timestamp on
+        chunk_size: Bytes read per backward step
+    """
+    if n_lines is None and since is None:
+        raise ValueError("Either n_lines or since must be given")
+    since = pd.Timestamp(since) if since is not None else None
+
+    with open(file_path, "rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+
+        # Ignore a trailing newline so it is not counted as an empty line
+        f.seek(max(end - 1, data_start))
+        if f.read(1) == b"\n":
+            end -= 1
+
+        pos = end
+        chunks = []
+        complete = 0
+        while pos > data_start:
+            step = min(chunk_size, pos - data_start)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            newlines = chunk.count(b"\n")
+            complete += newlines
+            if n_lines is not None and complete >= n_lines:
+                chunks.append(chunk)
+                break
+            if since is not None and newlines:
+                # Earliest complete line may run into the chunk read just before
+                probe = chunk + (chunks[-1] if chunks else b"")
+                first = probe[probe.index(b"\n") + 1:].split(b"\n", 1)[0]
+                chunks.append(chunk)
+                stamp = _line_datetime(first)
+                if stamp is not None and stamp < _match_tz(since, stamp.tz):
+                    break
+            else:
+                chunks.append(chunk)
+
+    lines = b"".join(reversed(chunks)).split(b"\n")
+    if pos > data_start:
+        # First line is partial (or belongs before the tail)
+        lines = lines[1:]
+    if n_lines is not None:
+        lines = lines[-n_lines:] if n_lines > 0 else []
+    return (header + b"\n".join(lines) + b"\n").decode("utf-8")
+
+
+def read_csv_tail(file_path: str, n_rows: Optional[int] = None, since=None) -> pd.DataFrame:
+    """
+    Parse only the trailing rows of a position-based input CSV.
+
+    The tail is only the latest data if rows were appended in
+    chronological order. When the parsed tail is not ascending, or ends
+    before the file's first row, the whole file is parsed instead (and
+    n_rows no longer limits the result).
+
+    Args:
+        file_path: Path to the CSV file
+        n_rows: Number of trailing lines to parse
+        since: Only keep rows at or after this timestamp (a naive since is
+            read in the data's time zone)
+
+    Returns:
+        Frame with COLUMN_NAMES (not yet deduplicated or sorted); Datetime
+        is converted when since is given
+    """
+    text = read_tail_text(file_path, n_rows, since)
+    df = pd.read_csv(io.StringIO(text), usecols=range(1, 8))
+    df.columns = COLUMN_NAMES
+    datetimes = pd.to_datetime(df["Datetime"])
+    first = _first_datetime(file_path)
+    if len(df) and (not datetimes.is_monotonic_increasing or (first is not None and datetimes.iloc[-1] < first)):
+        df = read_csv_full(file_path)
+        datetimes = pd.to_datetime(df["Datetime"])
+    if since is not None:
+        df["Datetime"] = datetimes
+        df = df[datetimes >= _match_tz(pd.Timestamp(since), getattr(datetimes.dtype, "tz", None))]
+    return df
+
+
+def read_csv_full(file_path: str, nrows: Optional[int] = None) -> pd.DataFrame:
+    """Parse a position-based input CSV, ignoring the first column."""
+    df = pd.read_csv(file_path, usecols=range(1, 8), nrows=nrows)
+    df.columns = COLUMN_NAMES
+    return df
@@ -0,0 +1,135 @@
+# resample.py
+
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+from .normalize import wall_clock
+
+# Column -> segmented reduction used to build higher-timeframe bars
+OHLCV_REDUCTIONS = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Adj Close": "last",
+    "Volume": "sum",
+}
+
+
+def timeframe_to_ns(timeframe: str) -> int:
+    """Parse a fixed-width timeframe such as '5min', '15min', '1h' or '1D' into nanoseconds."""
+    try:
+        ns = pd.Timedelta(timeframe).value
+    except ValueError as e:
+        raise ValueError(f"Unsupported timeframe: {timeframe} ({e})")
+    if ns <= 0:
+        raise ValueError(f"Timeframe must be positive: {timeframe}")
+    return ns
+
+
+def segment_bounds(datetimes: np.ndarray, timeframe: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate timeframe buckets in a sorted datetime64 array.
+
+    Args:
+        datetimes: Sorted datetime64[ns] values
+        timeframe: Bucket width
+
+    Returns:
+        tuple: (starts, bucket_ids) where starts are the first row of each
+        bucket and bucket_ids is the floored bucket key of every row.
+    """
+    ns = timeframe_to_ns(timeframe)
+    keys = datetimes.astype("datetime64[ns]").view(np.int64) // ns
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.intp), keys
+    change = np.empty(len(keys), dtype=bool)
+    change[0] = True
+    np.not_equal(keys[1:], keys[:-1], out=change[1:])
+    return np.flatnonzero(change), keys
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Build OHLCV bars for a coarser timeframe with segmented reductions.
+
+    Each bucket is a contiguous run of rows, so first/last are direct
+    gathers and max/min/sum are single ufunc.reduceat calls.
+
+    Args:
+        df: Sorted frame with Datetime and OHLCV columns
+        timeframe: Bucket width (e.g. '5min', '1h', '1D')
+
+    Returns:
+        tuple: (bars, starts) where bars is labelled by bucket open time and
+        starts maps each bar to its first source row.
+    """
+    # Buckets follow local wall-clock time; tz-aware labels are localized back below
+    datetimes = wall_clock(df["Datetime"])
+    starts, keys = segment_bounds(datetimes, timeframe)
+    ends = np.append(starts[1:], len(df)) - 1
+    ns = timeframe_to_ns(timeframe)
+
+    bars = {"Datetime": (keys[starts] * ns).astype("datetime64[ns]")}
+    for column, how in OHLCV_REDUCTIONS.items():
+        if column not in df.columns:
+            continue
+        values = df[column].to_numpy(dtype=np.float64)
+        if len(starts) == 0:
+            bars[column] = values[:0]
+        elif how == "first":
+            bars[column] = values[starts]
+        elif how == "last":
+            bars[column] = values[ends]
+        elif how == "max":
+            bars[column] = np.maximum.reduceat(values, starts)
+        elif how == "min":
+            bars[column] = np.minimum.reduceat(values, starts)
+        else:
+            bars[column] = np.add.reduceat(values, starts)
+
+    columns = ["Datetime"] + [c for c in df.columns if c in OHLCV_REDUCTIONS]
+    bars = pd.DataFrame(bars)[columns]
+    tz = getattr(df["Datetime"].dtype, "tz", None)
+    if tz is not None:
+        bars["Datetime"] = bars["Datetime"].dt.tz_localize(tz, ambiguous=False, nonexistent="shift_forward")
+    return bars, starts
+
+
+def align_to_source(values: np.ndarray, starts: np.ndarray, n_rows: int, fill=None) -> np.ndarray:
+    """
+    Forward-fill bar values onto the source rows without lookahead.
+
+    A bar's value becomes visible on the last source row of that bar (when
+    the bar closes) and is carried forward until the next bar closes; rows
+    inside a still-forming bar see the previous completed bar.
+
+    Args:
+        values: One value per bar
+        starts: First source row of each bar
+        n_rows: Number of source rows
+        fill: Value for rows before the first completed bar, keeping the
+            dtype of values (e.g. -1 for Categorical codes); NaN or None by default
+
+    Returns:
+        Array of length n_rows
+    """
+    is_start = np.zeros(n_rows, dtype=bool)
+    is_start[starts] = True
+    bar = np.cumsum(is_start) - 1
+    is_last = np.ones(n_rows, dtype=bool)
+    is_last[:-1] = is_start[1:]
+    source = bar - (~is_last)
+
+    if fill is not None:
+        out = np.full(n_rows, fill, dtype=values.dtype)
+    elif values.dtype.kind in "fc":
+        out = np.full(n_rows, np.nan, dtype=values.dtype)
+    elif values.dtype.kind in "iub":
+        out = np.full(n_rows, np.nan)
+    else:
+        out = np.full(n_rows, None, dtype=object)
+    visible = source >= 0
+    out[visible] = values[source[visible]]
+    return out
@@ -0,0 +1,178 @@
+# sessions.py
+
+import numpy as np
+import pandas as pd
+from typing import Iterable, Union
+
+
+def _starts_from_keys(keys: np.ndarray) -> np.ndarray:
+    """Boolean mask of rows where the key differs from the previous row."""
+    change = np.empty(len(keys), dtype=bool)
+    if len(keys):
+        change[0] = True
+        np.not_equal(keys[1:], keys[:-1], out=change[1:])
+    return change
+
+
+def session_ids(datetimes: np.ndarray, anchor: str = "session") -> np.ndarray:
+    """
+    Segment id of every row for a calendar anchor.
+
+    Args:
+        datetimes: Sorted datetime64 values
+        anchor: "session" (calendar day), "week" (ISO week, starting Monday) or "month"
+
+    Returns:
+        int64 array of ids 0..k-1, constant within a segment
+    """
+    days = datetimes.astype("datetime64[D]").view(np.int64)
+    if anchor == "session":
+        keys = days
+    elif anchor == "week":
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        keys = (days + 3) // 7
+    elif anchor == "month":
+        keys = datetimes.astype("datetime64[M]").view(np.int64)
+    else:
+        raise ValueError(f"Unsupported anchor: {anchor}")
+    return np.cumsum(_starts_from_keys(keys)) - 1
+
+
+def anchored_ids(datetimes: np.ndarray, anchor: Union[str, pd.Timestamp]) -> np.ndarray:
+    """Single segment from the first row at or after anchor; -1 for earlier rows."""
+    start = np.searchsorted(datetimes, np.datetime64(pd.Timestamp(anchor)), side="left")
+    ids = np.zeros(len(datetimes), dtype=np.int64)
+    ids[:start] = -1
+    return ids
+
+
+def segmented_cumsum(values: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """
+    Cumulative sum that restarts at every change of segment id.
+
+    One global cumsum is taken and each segment subtracts the running total
+    reached just before its first row. NaN values are skipped like a
+    groupby cumsum does (their own row is NaN, later rows are unaffected)
+    and rows with a negative id are NaN.
+
+    Args:
+        values: float64 values
+        ids: Non-decreasing segment ids (negative = outside any segment)
+    """
+    missing = np.isnan(values)
+    total = np.cumsum(np.where(missing, 0.0, values))
+    starts = _starts_from_keys(ids)
+    offset = np.concatenate(([0.0], total[:-1]))[starts]
+    out = total - offset[np.cumsum(starts) - 1]
+    out[missing | (ids < 0)] = np.nan
+    return out
+
+
+def segmented_extremes(high: np.ndarray, low: np.ndarray, ids: np.ndarray):
+    """
+    Running high and low that restart at every change of segment id.
+
+    Each value only uses rows up to and including its own, so the result is
+    point-in-time (the session high/low as known at that bar). NaN prices
+    are skipped.
+
+    Args:
+        high, low: Price arrays
+        ids: Non-decreasing segment ids
+
+    Returns:
+        tuple: (running high, running low)
+    """
+    running_high = np.empty(len(high))
+    running_low = np.empty(len(low))
+    starts, ends = segment_bounds(ids)
+    for start, end in zip(starts, ends + 1):
+        np.fmax.accumulate(high[start:end], out=running_high[start:end])
+        np.fmin.accumulate(low[start:end], out=running_low[start:end])
+    return running_high, running_low
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+         ids: np.ndarray) -> np.ndarray:
+    """
+    Volume-weighted average of the typical price, reset at every segment.
+
+    Args:
+        high, low, close, volume: Price and volume arrays
+        ids: Segment ids from session_ids or anchored_ids
+
+    Returns:
+        VWAP array (NaN where cumulative volume is zero or id is negative)
+    """
+    typical = (high + low + close) / 3
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return segmented_cumsum(typical * volume, ids) / segmented_cumsum(volume, ids)
+
+
+def anchor_label(anchor: Union[str, pd.Timestamp]) -> str:
+    """Column suffix for an anchored VWAP, e.g. 202508190930."""
+    return pd.Timestamp(anchor).strftime("%Y%m%d%H%M")
+
+
+def anchored_vwaps(high, low, close, volume, datetimes: np.ndarray,
+                   anchors: Iterable) -> dict:
+    """Anchored VWAP column per timestamp, keyed AVWAP_<YYYYmmddHHMM>."""
+    return {
+        f"AVWAP_{anchor_label(anchor)}": vwap(high, low, close, volume, anchored_ids(datetimes, anchor))
+        for anchor in anchors
+    }
+
+
+def segment_bounds(ids: np.ndarray):
+    """First and last row of every segment of a non-decreasing id array."""
+    starts = np.flatnonzero(_starts_from_keys(ids))
+    ends = np.append(starts[1:], len(ids)) - 1
+    return starts, ends
+
+
+# Gap_Type labels; the integer code of a label is its position in this list
+GAP_TYPES = ["Common", "Breakaway"]
+
+
+def _expanding_std(values: np.ndarray) -> np.ndarray:
+    """Sample standard deviation of the finite values up to and including each position."""
+    finite = np.isfinite(values)
+    shift = values[finite][0] if finite.any() else 0.0
+    centered = np.where(finite, values - shift, 0.0)
+    count = np.cumsum(finite)
+    total = np.cumsum(centered)
+    squares = np.cumsum(centered * centered)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (squares - total * total / count) / (count - 1)
+    return np.where(count > 1, np.sqrt(np.maximum(var, 0.0)), np.nan)
+
+
+def session_gaps(open_: np.ndarray, close: np.ndarray, ids: np.ndarray, expanding: bool = False):
+    """
+    Opening gap of every session against the previous session's close.
+
+    A gap is classified Breakaway when it is positive and larger than the
+    standard deviation of all gaps, otherwise Common. With expanding, each
+    gap is compared against the gaps up to and including its own session
+    only, so the label is known at the session open (no lookahead).
+
+    Args:
+        open_, close: Price arrays
+        ids: Session ids from session_ids
+        expanding: Use the expanding instead of the full-history gap dispersion
+
+    Returns:
+        tuple: (gap per session, int8 GAP_TYPES code per session)
+    """
+    starts, ends = segment_bounds(ids)
+    gap = np.full(len(starts), np.nan)
+    gap[1:] = open_[starts[1:]] - close[ends[:-1]]
+    if expanding:
+        std = _expanding_std(gap)
+    else:
+        finite = gap[~np.isnan(gap)]
+        std = finite.std(ddof=1) if len(finite) > 1 else np.nan
+    with np.errstate(invalid="ignore"):
+        breakaway = (np.abs(gap) > std) & (gap > 0)
+    codes = np.where(breakaway, GAP_TYPES.index("Breakaway"), GAP_TYPES.index("Common")).astype(np.int8)
+    return gap, codes
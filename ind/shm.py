@@ -0,0 +1,131 @@
+# shm.py
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing block owned by another process.
+
+    Before Python 3.13 attaching also registers the block with the resource
+    tracker; pool workers share the owner's tracker, so this is a no-op
+    there and the owner's unlink remains the only cleanup.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedBars:
+    """
+    OHLCV arrays and timestamps in one shared-memory block.
+
+    The owner copies the arrays in once; workers attach by name and get
+    zero-copy NumPy views, so only a small descriptor crosses the process
+    boundary. Each column occupies a contiguous float64 region and the
+    Datetime column is stored as int64 nanoseconds.
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory, n_rows: int, columns: List[str], owner: bool):
+        self._block = block
+        self.n_rows = n_rows
+        self.columns = columns
+        self.owner = owner
+        matrix = np.ndarray((len(columns) + 1, n_rows), dtype=np.float64, buffer=block.buf)
+        self.datetimes = matrix[0].view(np.int64)
+        self.arrays: Dict[str, np.ndarray] = {column: matrix[i + 1] for i, column in enumerate(columns)}
+        if not owner:
+            for values in self.arrays.values():
+                values.flags.writeable = False
+            self.datetimes.flags.writeable = False
+
+    @classmethod
+    def create(cls, arrays: Dict[str, np.ndarray], datetimes: np.ndarray) -> "SharedBars":
+        """
+        Copy arrays and timestamps into a new shared-memory block.
+
+        Args:
+            arrays: Column name -> float64 array (all the same length)
+            datetimes: datetime64 timestamps, one per row
+        """
+        n_rows = len(datetimes)
+        columns = list(arrays)
+        size = max((len(columns) + 1) * n_rows * 8, 1)
+        shared = cls(shared_memory.SharedMemory(create=True, size=size), n_rows, columns, owner=True)
+        shared.datetimes[:] = datetimes.astype("datetime64[ns]").view(np.int64)
+        for column, values in arrays.items():
+            shared.arrays[column][:] = values
+        return shared
+
+    @property
+    def descriptor(self) -> Tuple[str, int, List[str]]:
+        """Picklable handle passed to workers: (block name, rows, columns)."""
+        return self._block.name, self.n_rows, self.columns
+
+    @classmethod
+    def attach(cls, descriptor: Tuple[str, int, List[str]]) -> "SharedBars":
+        """Attach read-only to a block created by another process."""
+        name, n_rows, columns = descriptor
+        return cls(_attach_block(name), n_rows, list(columns), owner=False)
+
+    def frame(self) -> pd.DataFrame:
+        """Datetime column as a DataFrame (prices stay in the shared arrays)."""
+        return pd.DataFrame({"Datetime": self.datetimes.view("datetime64[ns]")})
+
+    def close(self) -> None:
+        """Release this process's mapping; the owner also unlinks the block."""
+        self.arrays = {}
+        self.datetimes = None
+        self._block.close()
+        if self.owner:
+            self._block.unlink()
+
+    def __enter__(self) -> "SharedBars":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# Per-worker cache of attached blocks, keyed by block name
+_attached: Dict[str, object] = {}
+
+
+def _worker_compute(descriptor: Tuple[str, int, List[str]], name: str, kwargs: dict) -> Dict[str, np.ndarray]:
+    """Process-pool task: compute one indicator family over the shared bars."""
+    from .processor import IndicatorProcessor
+
+    processor = _attached.get(descriptor[0])
+    if processor is None:
+        processor = IndicatorProcessor.from_shared(SharedBars.attach(descriptor))
+        _attached[descriptor[0]] = processor
+    return processor.compute_indicator(name, **kwargs)
+
+
+def compute_in_processes(shared: SharedBars, indicators: List[Tuple[str, dict]],
+                         processes: int) -> Dict[str, np.ndarray]:
+    """
+    Compute indicator families in worker processes over shared inputs.
+
+    Workers attach to the block once and return only their output columns.
+
+    Args:
+        shared: Block created with SharedBars.create
+        indicators: (name, kwargs) pairs
+        processes: Worker process count
+
+    Returns:
+        Merged dict of output columns, in the order of indicators
+    """
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_worker_compute, shared.descriptor, name, kwargs) for name, kwargs in indicators]
+        merged: Dict[str, np.ndarray] = {}
+        for future in futures:
+            merged.update(future.result())
+    return merged
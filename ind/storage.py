@@ -0,0 +1,210 @@
+# storage.py
+
+import sqlite3
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# Database file suffix -> backend
+DATABASE_SUFFIXES = {".sqlite": "sqlite", ".sqlite3": "sqlite", ".db": "sqlite", ".duckdb": "duckdb"}
+
+# File written by save_results for each backend
+DATABASE_FILES = {"sqlite": "indicators.sqlite", "duckdb": "indicators.duckdb"}
+
+# One wide table; (ticker, Datetime) is the primary key
+TABLE = "bars"
+
+# Rows bound per executemany call
+DEFAULT_CHUNK_ROWS = 50_000
+
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def is_database(path: Union[str, Path]) -> bool:
+    """Whether path names an embedded database rather than a CSV file."""
+    return Path(path).suffix.lower() in DATABASE_SUFFIXES
+
+
+def _backend(path: Union[str, Path], backend: Optional[str]) -> str:
+    backend = backend or DATABASE_SUFFIXES.get(Path(path).suffix.lower(), "sqlite")
+    if backend not in DATABASE_FILES:
+        raise ValueError(f"Unsupported storage backend: {backend}")
+    return backend
+
+
+def connect(path: Union[str, Path], backend: Optional[str] = None):
+    """
+    Open a SQLite or DuckDB connection.
+
+    Args:
+        path: Database file
+        backend: "sqlite" or "duckdb" (requires the duckdb package); inferred from the suffix by default
+    """
+    backend = _backend(path, backend)
+    if backend == "duckdb":
+        try:
+            import duckdb
+        except ImportError:
+            raise ValueError("The duckdb backend requires the duckdb package")
+        return duckdb.connect(str(path))
+    # Concurrent writers (e.g. watch mode workers) wait for the lock instead of failing
+    con = sqlite3.connect(str(path), timeout=60)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    return con
+
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_type(dtype, backend: str) -> str:
+    if dtype.kind == "f":
+        return "DOUBLE" if backend == "duckdb" else "REAL"
+    if dtype.kind in "iub":
+        return "BIGINT" if backend == "duckdb" else "INTEGER"
+    if dtype.kind == "M":
+        return "TIMESTAMP" if backend == "duckdb" else "TEXT"
+    return "VARCHAR" if backend == "duckdb" else "TEXT"
+
+
+def _table_columns(con, backend: str, table: str) -> List[str]:
+    if backend == "duckdb":
+        rows = con.execute("SELECT column_name FROM information_schema.columns WHERE table_name = ? "
+                           "ORDER BY ordinal_position", [table]).fetchall()
+        return [row[0] for row in rows]
+    return [row[1] for row in con.execute(f"PRAGMA table_info({_quote(table)})").fetchall()]
+
+
+def _ensure_table(con, backend: str, table: str, df: pd.DataFrame) -> None:
+    """Create the table on first use and add columns the frame introduces."""
+    existing = _table_columns(con, backend, table)
+    if not existing:
+        columns = ", ".join(f"{_quote(c)} {_sql_type(df[c].dtype, backend)}" for c in df.columns if c != "Datetime")
+        con.execute(f"CREATE TABLE {_quote(table)} (ticker {_sql_type(np.dtype(object), backend)} NOT NULL, "
+                    f"\"Datetime\" {_sql_type(np.dtype('datetime64[ns]'), backend)} NOT NULL, {columns}, "
+                    f"PRIMARY KEY (ticker, \"Datetime\"))")
+        return
+    for column in df.columns:
+        if column not in existing:
+            con.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)} {_sql_type(df[column].dtype, backend)}")
+
+
+def _column_values(series: pd.Series) -> list:
+    """Python values for binding; NaN/NaT become NULL."""
+    if series.dtype.kind == "M":
+        return series.dt.strftime(_TIMESTAMP_FORMAT).tolist()
+    if series.dtype.kind in "fiub":
+        return series.tolist()
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def write_frame(path: Union[str, Path], ticker: str, df: pd.DataFrame, backend: Optional[str] = None,
+                table: str = TABLE, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+    """
+    Upsert one ticker's bars and indicators into an embedded database.
+
+    Rows are keyed on (ticker, Datetime): re-running on an updated file
+    replaces the rows that already exist and inserts the new ones, in one
+    transaction. Columns are added to the table as new indicators appear.
+    SQLite binds rows in chunks with executemany; DuckDB inserts straight
+    from the DataFrame.
+
+    Args:
+        path: Database file (created if missing)
+        ticker: Ticker stored with every row
+        df: Frame with a Datetime column
+        backend: "sqlite" or "duckdb"; inferred from the suffix by default
+        table: Table name
+        chunk_rows: Rows bound per executemany call (SQLite)
+
+    Returns:
+        Number of rows written
+    """
+    backend = _backend(path, backend)
+    columns = ["ticker"] + [str(c) for c in df.columns]
+    column_list = ", ".join(_quote(c) for c in columns)
+    con = connect(path, backend)
+    try:
+        if backend == "duckdb":
+            frame = df.copy()
+            for column in frame.columns:
+                if isinstance(frame[column].dtype, pd.CategoricalDtype):
+                    frame[column] = frame[column].astype(object)
+            frame.insert(0, "ticker", ticker)
+            con.execute("BEGIN TRANSACTION")
+            _ensure_table(con, backend, table, df)
+            con.register("_frame", frame)
+            con.execute(f"INSERT OR REPLACE INTO {_quote(table)} ({column_list}) SELECT {column_list} FROM _frame")
+            con.unregister("_frame")
+            con.execute("COMMIT")
+            return len(df)
+
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{_quote(c)} = excluded.{_quote(c)}" for c in columns[2:])
+        sql = (f"INSERT INTO {_quote(table)} ({column_list}) VALUES ({placeholders}) "
+               f"ON CONFLICT (ticker, \"Datetime\") DO UPDATE SET {updates}")
+        with con:
+            _ensure_table(con, backend, table, df)
+            for start in range(0, len(df), chunk_rows):
+                block = df.iloc[start:start + chunk_rows]
+                values = [_column_values(block[c]) for c in df.columns]
+                con.executemany(sql, zip([ticker] * len(block), *values))
+        return len(df)
+    finally:
+        con.close()
+
+
+def read_frame(path: Union[str, Path], ticker: str, columns: Optional[Sequence[str]] = None, start=None, end=None,
+               last_n: Optional[int] = None, backend: Optional[str] = None, table: str = TABLE) -> pd.DataFrame:
+    """
+    Read one ticker's rows from an embedded database through its primary key.
+
+    Args:
+        path: Database file
+        ticker: Ticker to read
+        columns: Columns to return besides Datetime (all by default)
+        start: Only rows at or after this timestamp
+        end: Only rows at or before this timestamp
+        last_n: Only the last N rows (after the start/end filter)
+        backend: "sqlite" or "duckdb"; inferred from the suffix by default
+        table: Table name
+
+    Returns:
+        Frame sorted by Datetime, with Datetime converted to datetime64
+    """
+    backend = _backend(path, backend)
+    if not Path(path).exists():
+        raise ValueError(f"Database not found: {path}")
+    con = connect(path, backend)
+    try:
+        if columns is None:
+            selected = [c for c in _table_columns(con, backend, table) if c != "ticker"]
+        else:
+            selected = ["Datetime"] + [c for c in columns if c != "Datetime"]
+        conditions, params = ["ticker = ?"], [ticker]
+        if start is not None:
+            conditions.append("\"Datetime\" >= ?")
+            params.append(pd.Timestamp(start).strftime(_TIMESTAMP_FORMAT))
+        if end is not None:
+            conditions.append("\"Datetime\" <= ?")
+            params.append(pd.Timestamp(end).strftime(_TIMESTAMP_FORMAT))
+        sql = (f"SELECT {', '.join(_quote(c) for c in selected)} FROM {_quote(table)} "
+               f"WHERE {' AND '.join(conditions)} ORDER BY \"Datetime\"")
+        if last_n is not None:
+            sql = f"SELECT * FROM ({sql} DESC LIMIT {int(last_n)}) ORDER BY \"Datetime\""
+        if backend == "duckdb":
+            df = con.execute(sql, params).df()
+        else:
+            df = pd.read_sql_query(sql, con, params=params)
+            # All-NULL columns come back as object; restore the declared REAL type
+            declared = {row[1]: row[2] for row in con.execute(f"PRAGMA table_info({_quote(table)})").fetchall()}
+            for column in df.columns:
+                if declared.get(column) == "REAL" and df[column].dtype == object:
+                    df[column] = df[column].astype(float)
+    finally:
+        con.close()
+    df["Datetime"] = pd.to_datetime(df["Datetime"])
+    return df
@@ -0,0 +1,219 @@
+# sweep.py
+
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import talib
+
+from .rolling import RollingEngine
+
+
+class SweepResult(NamedTuple):
+    """
+    Output of a parameter sweep.
+
+    Attributes:
+        values: 2-D array of shape (rows, columns), one column per output line
+        columns: Column names, following the add_indicator naming scheme
+        params: Parameter tuple that produced each column
+    """
+    values: np.ndarray
+    columns: List[str]
+    params: List[Tuple]
+
+    def to_frame(self, index=None) -> pd.DataFrame:
+        """Convert the sweep to a DataFrame (copies nothing beyond pandas' own wrapping)."""
+        return pd.DataFrame(self.values, columns=self.columns, index=index)
+
+
+def parameter_grid(*axes: Iterable) -> List[Tuple]:
+    """Cartesian product of parameter axes, e.g. parameter_grid([10, 20], [1.5, 2])."""
+    return list(itertools.product(*axes))
+
+
+def _map(func: Callable, items: Sequence, workers: Optional[int]) -> List:
+    """Apply func to items, on a thread pool when workers > 1 (TA-Lib and NumPy release the GIL)."""
+    if workers and workers > 1 and len(items) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, items))
+    return [func(item) for item in items]
+
+
+def _allocate(n_rows: int, n_cols: int, dtype) -> np.ndarray:
+    # Column-major so each output column is one contiguous write
+    return np.empty((n_rows, n_cols), dtype=dtype, order="F")
+
+
+def _ema_table(close: np.ndarray, periods: Iterable[int], workers: Optional[int]) -> Dict[int, np.ndarray]:
+    """One EMA per distinct period, shared by every combination that needs it."""
+    distinct = sorted(set(periods))
+    emas = _map(lambda period: talib.EMA(close, timeperiod=period), distinct, workers)
+    return dict(zip(distinct, emas))
+
+
+def sweep_ema(close, periods: Iterable[int], workers: Optional[int] = None, dtype=np.float64) -> SweepResult:
+    """
+    EMA of close for each period.
+
+    Args:
+        close: Close prices
+        periods: EMA periods
+        workers: Thread count for parallel evaluation (None or 1 for serial)
+        dtype: Output dtype (float32 halves memory for large grids)
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    periods = list(periods)
+    table = _ema_table(close, periods, workers)
+    values = _allocate(len(close), len(periods), dtype)
+    for j, period in enumerate(periods):
+        values[:, j] = table[period]
+    return SweepResult(values, [f"EMA_{p}" for p in periods], [(p,) for p in periods])
+
+
+def rsi_table(close: np.ndarray, periods: Iterable[int], workers: Optional[int] = None) -> Dict[int, np.ndarray]:
+    """
+    RSI for each distinct period.
+
+    Each period is one TA-Lib pass (a C loop over the price deltas), run
+    on a thread pool when workers > 1; duplicate periods are computed once.
+    """
+    distinct = sorted(set(periods))
+    values = _map(lambda period: talib.RSI(close, timeperiod=period), distinct, workers)
+    return dict(zip(distinct, values))
+
+
+def atr_table(high: np.ndarray, low: np.ndarray, close: np.ndarray, periods: Iterable[int],
+              workers: Optional[int] = None) -> Dict[int, np.ndarray]:
+    """ATR for each distinct period, one TA-Lib pass per period (threaded when workers > 1)."""
+    distinct = sorted(set(periods))
+    values = _map(lambda period: talib.ATR(high, low, close, timeperiod=period), distinct, workers)
+    return dict(zip(distinct, values))
+
+
+def _sweep_table(table: Dict[int, np.ndarray], prefix: str, periods: List[int], dtype) -> SweepResult:
+    n_rows = len(next(iter(table.values()))) if table else 0
+    values = _allocate(n_rows, len(periods), dtype)
+    for j, period in enumerate(periods):
+        values[:, j] = table[period]
+    return SweepResult(values, [f"{prefix}_{p}" for p in periods], [(p,) for p in periods])
+
+
+def sweep_rsi(close, periods: Iterable[int], workers: Optional[int] = None, dtype=np.float64) -> SweepResult:
+    """RSI of close for each period."""
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    periods = list(periods)
+    return _sweep_table(rsi_table(close, periods, workers), "RSI", periods, dtype)
+
+
+def sweep_atr(high, low, close, periods: Iterable[int], workers: Optional[int] = None,
+              dtype=np.float64) -> SweepResult:
+    """ATR for each period."""
+    high, low, close = (np.ascontiguousarray(a, dtype=np.float64) for a in (high, low, close))
+    periods = list(periods)
+    return _sweep_table(atr_table(high, low, close, periods, workers), "ATR", periods, dtype)
+
+
+def sweep_sma(close, periods: Iterable[int], engine: Optional[RollingEngine] = None, dtype=np.float64) -> SweepResult:
+    """SMA of close for each period, from the engine's blockwise prefix sums."""
+    engine = engine or RollingEngine(close)
+    periods = list(periods)
+    values = _allocate(len(engine.close), len(periods), dtype)
+    for j, period in enumerate(periods):
+        values[:, j] = engine.sma(period)
+    return SweepResult(values, [f"SMA_{p}" for p in periods], [(p,) for p in periods])
+
+
+def sweep_macd(close, triples: Iterable[Tuple[int, int, int]], workers: Optional[int] = None,
+               dtype=np.float64) -> SweepResult:
+    """
+    MACD line, signal and histogram for each (fast, slow, signal) triple.
+
+    Values match talib.MACD (and add_indicator("MACD")): the slow EMA is
+    computed once per distinct period and the fast EMA once per distinct
+    (fast, slow) pair, seeded like TA-Lib on the fast bars ending where
+    the slow EMA starts; every signal period shares that line. The line
+    and histogram are NaN until the signal has warmed up, as in TA-Lib.
+
+    Args:
+        close: Close prices
+        triples: (fast, slow, signal) combinations; fast must be < slow
+        workers: Thread count for parallel evaluation (None or 1 for serial)
+        dtype: Output dtype
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    triples = [tuple(t) for t in triples]
+    for fast, slow, _ in triples:
+        if fast >= slow:
+            raise ValueError(f"MACD fast period must be < slow period, got ({fast}, {slow})")
+    table = _ema_table(close, [t[1] for t in triples], workers)
+
+    def fast_ema(pair):
+        fast, slow = pair
+        ema = np.full(len(close), np.nan)
+        ema[slow - fast:] = talib.EMA(close[slow - fast:], timeperiod=fast)
+        return ema
+
+    pairs = sorted({t[:2] for t in triples})
+    lines = {pair: ema - table[pair[1]] for pair, ema in zip(pairs, _map(fast_ema, pairs, workers))}
+
+    def signal_line(triple):
+        fast, slow, signal = triple
+        return talib.EMA(lines[(fast, slow)], timeperiod=signal)
+
+    signals = _map(signal_line, triples, workers)
+
+    values = _allocate(len(close), 3 * len(triples), dtype)
+    columns: List[str] = []
+    params: List[Tuple] = []
+    for j, (triple, signal) in enumerate(zip(triples, signals)):
+        macd = lines[triple[:2]].copy()
+        macd[:triple[1] + triple[2] - 2] = np.nan
+        values[:, 3 * j] = macd
+        values[:, 3 * j + 1] = signal
+        values[:, 3 * j + 2] = macd - signal
+        suffix = "_".join(str(p) for p in triple)
+        columns += [f"MACD_{suffix}", f"MACD_Signal_{suffix}", f"MACD_Hist_{suffix}"]
+        params += [triple] * 3
+    return SweepResult(values, columns, params)
+
+
+def sweep_bollinger(close, grid: Iterable[Tuple[int, float]], engine: Optional[RollingEngine] = None,
+                    dtype=np.float64) -> SweepResult:
+    """
+    Bollinger Bands for each (period, std_dev) pair.
+
+    Mean and standard deviation are computed once per distinct period and
+    shared by every deviation multiplier.
+    """
+    engine = engine or RollingEngine(close)
+    grid = [tuple(g) for g in grid]
+    bands = engine.bbands_many(grid)
+    values = _allocate(len(engine.close), 3 * len(grid), dtype)
+    columns: List[str] = []
+    params: List[Tuple] = []
+    for j, combo in enumerate(grid):
+        for i, line in enumerate(bands[combo]):
+            values[:, 3 * j + i] = line
+        suffix = "_".join(str(p) for p in combo)
+        columns += [f"BB_Upper_{suffix}", f"BB_Middle_{suffix}", f"BB_Lower_{suffix}"]
+        params += [combo] * 3
+    return SweepResult(values, columns, params)
+
+
+def sweep_stoch(engine: RollingEngine, grid: Iterable[Tuple[int, int, int]], dtype=np.float64) -> SweepResult:
+    """Slow STOCH %K/%D for each (fastk, slowk, slowd) triple, sharing High/Low extremes."""
+    grid = [tuple(g) for g in grid]
+    values = _allocate(len(engine.close), 2 * len(grid), dtype)
+    columns: List[str] = []
+    params: List[Tuple] = []
+    for j, combo in enumerate(grid):
+        k, d = engine.stoch(*combo)
+        values[:, 2 * j] = k
+        values[:, 2 * j + 1] = d
+        suffix = "_".join(str(p) for p in combo)
+        columns += [f"Stoch_K_{suffix}", f"Stoch_D_{suffix}"]
+        params += [combo] * 2
+    return SweepResult(values, columns, params)
@@ -0,0 +1,145 @@
+# tail.py
+
+import math
+from typing import Iterable, Optional, Tuple, Union
+
+import pandas as pd
+
+from .plugins import get_indicator, plugin_warmup
+
+# Default convergence tolerance for recursive (EMA-family) indicators
+DEFAULT_TOLERANCE = 1e-6
+
+# Indicators whose values depend on whole sessions rather than a bar count.
+# Tail evaluation starts these at the session before the requested rows.
+SESSION_INDICATORS = {"VWAP", "PIVOT_POINTS", "VOLUME_PROFILE", "GAPS", "SESSION_RANGE"}
+
+
+# Calendar anchors a session indicator can need, from shortest to longest
+SESSION_ANCHORS = ["session", "week", "month"]
+
+# Anchor of indicators that depend on every session loaded (GAPS classifies each
+# gap against the dispersion of all gaps), so tail evaluation keeps the whole history
+HISTORY_ANCHOR = "history"
+
+# Pivot period code -> anchor whose previous period the levels come from
+_PIVOT_ANCHORS = {"D": "session", "W": "week", "M": "month"}
+
+
+def session_anchor(indicator: str, kwargs: dict) -> Union[str, pd.Timestamp]:
+    """
+    Calendar period whose previous occurrence a session indicator needs.
+
+    Tail evaluation of a session indicator starts at the first row of the
+    period before the one holding the requested rows: the previous day for
+    daily sessions, the previous week or month for weekly or monthly pivots
+    and week- or month-anchored VWAP. VWAP anchored at timestamps starts at
+    the earliest anchor instead, and GAPS, whose labels depend on every
+    gap, needs the whole history (HISTORY_ANCHOR).
+
+    Args:
+        indicator: Session indicator name
+        kwargs: Indicator parameters
+
+    Returns:
+        One of SESSION_ANCHORS, HISTORY_ANCHOR or the earliest VWAP anchor timestamp
+    """
+    indicator = indicator.upper()
+    if indicator == "PIVOT_POINTS":
+        anchors = [_PIVOT_ANCHORS.get(str(period).upper(), "session") for period in kwargs.get("periods", ["D"])]
+        return max(anchors, key=SESSION_ANCHORS.index)
+    if indicator == "VWAP":
+        anchor = kwargs.get("anchor", "session")
+        if isinstance(anchor, str):
+            return anchor if anchor in SESSION_ANCHORS else "session"
+        return min(pd.Timestamp(a) for a in anchor)
+    if indicator == "GAPS":
+        return HISTORY_ANCHOR
+    return "session"
+
+
+def recursive_warmup(alpha: float, tolerance: float = DEFAULT_TOLERANCE) -> int:
+    """
+    Bars needed for an exponential recursion to forget its seed.
+
+    An EMA-style filter with smoothing factor alpha weights the state from
+    W bars ago by (1 - alpha) ** W. Truncating history after W bars
+    therefore changes the output by at most tolerance times the distance
+    between the seed and the true value (for prices, a fraction of the
+    price range over the warm-up window).
+
+    Args:
+        alpha: Smoothing factor in (0, 1]
+        tolerance: Maximum residual weight of the discarded history
+    """
+    if alpha >= 1:
+        return 0
+    return int(math.ceil(math.log(tolerance) / math.log(1.0 - alpha)))
+
+
+def ema_warmup(period: int, tolerance: float = DEFAULT_TOLERANCE) -> int:
+    """Warm-up bars for a TA-Lib EMA (alpha = 2 / (period + 1), SMA seed of period bars)."""
+    return period - 1 + recursive_warmup(2.0 / (period + 1), tolerance)
+
+
+def wilder_warmup(period: int, tolerance: float = DEFAULT_TOLERANCE) -> int:
+    """Warm-up bars for Wilder smoothing (alpha = 1 / period) as used by RSI and ATR."""
+    return period + recursive_warmup(1.0 / period, tolerance)
+
+
+def warmup_bars(indicator: str, kwargs: dict, tolerance: float = DEFAULT_TOLERANCE) -> Optional[int]:
+    """
+    Bars of history an indicator needs before its first exact (or converged) value.
+
+    Args:
+        indicator: Indicator name as accepted by add_indicator
+        kwargs: Indicator parameters
+        tolerance: Convergence tolerance for recursive indicators
+
+    Returns:
+        Bar count, or None for session-based indicators
+    """
+    indicator = indicator.upper()
+    if indicator in SESSION_INDICATORS:
+        return None
+    if indicator == "SMA":
+        return max(kwargs.get("periods", [20])) - 1
+    if indicator == "EMA":
+        return max(ema_warmup(p, tolerance) for p in kwargs.get("periods", [20]))
+    if indicator == "BOLLINGER":
+        return kwargs.get("period", 20) - 1
+    if indicator == "ATR":
+        return max(wilder_warmup(p, tolerance) for p in kwargs.get("periods", [kwargs.get("period", 14)]))
+    if indicator == "RSI":
+        return max(wilder_warmup(p, tolerance) for p in kwargs.get("periods", [5, 14]))
+    if indicator == "MACD":
+        slow = kwargs.get("slow", 13)
+        signal = kwargs.get("signal", 9)
+        return ema_warmup(slow, tolerance) + ema_warmup(signal, tolerance)
+    if indicator == "STOCH":
+        return kwargs.get("fastk", 5) + kwargs.get("slowk", 3) + kwargs.get("slowd", 3) - 3
+    if indicator == "FVG":
+        return 2
+    spec = get_indicator(indicator)
+    if spec is not None:
+        return plugin_warmup(spec, kwargs)
+    raise ValueError(f"Unsupported indicator: {indicator}")
+
+
+def required_bars(indicators: Iterable[Tuple[str, dict]], k: int = 1,
+                  tolerance: float = DEFAULT_TOLERANCE) -> Tuple[int, bool]:
+    """
+    Rows needed to evaluate the last k values of every indicator.
+
+    Returns:
+        tuple: (bar count, whether any indicator also needs whole sessions)
+    """
+    bars = 0
+    sessions = False
+    for name, kwargs in indicators:
+        warmup = warmup_bars(name, kwargs, tolerance)
+        if warmup is None:
+            sessions = True
+        else:
+            bars = max(bars, warmup)
+    return bars + k, sessions
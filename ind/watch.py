@@ -0,0 +1,241 @@
+# watch.py
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .batch import ProcessOptions, output_path, process_file
+
+# inotify event bits (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal inotify binding through libc (Linux only)."""
+
+    def __init__(self, folder: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(str(folder)), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {folder}")
+
+    def read(self, timeout: float) -> List[str]:
+        """File names with events, waiting at most timeout seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return []
+        names = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            names.append(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+            offset += length
+        return names
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Poller:
+    """Polling fallback: compares (mtime, size) of every CSV between scans."""
+
+    def __init__(self, folder: Path):
+        self.folder = folder
+        self.seen: Dict[str, Tuple[int, int]] = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        state = {}
+        for path in self.folder.glob("*.csv"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            state[path.name] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def read(self, timeout: float) -> List[str]:
+        time.sleep(timeout)
+        current = self._scan()
+        changed = [name for name, key in current.items() if self.seen.get(name) != key]
+        self.seen = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class WatchStats:
+    """Thread-safe counters for watch mode."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.detected = 0
+        self.processed = 0
+        self.failed = 0
+        self.pending = 0
+        self.running = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._total_latency = 0.0
+
+    def record(self, latency: float, ok: bool) -> None:
+        """Record a finished file; latency runs from the first unprocessed change to completion."""
+        with self._lock:
+            if ok:
+                self.processed += 1
+            else:
+                self.failed += 1
+            self.last_latency = latency
+            self.max_latency = max(self.max_latency, latency)
+            self._total_latency += latency
+
+    def snapshot(self) -> dict:
+        """Current counters, including queue depth (pending + running) and mean latency."""
+        with self._lock:
+            finished = self.processed + self.failed
+            return {
+                "detected": self.detected,
+                "processed": self.processed,
+                "failed": self.failed,
+                "queue_depth": self.pending + self.running,
+                "running": self.running,
+                "last_latency": round(self.last_latency, 3),
+                "mean_latency": round(self._total_latency / finished, 3) if finished else 0.0,
+                "max_latency": round(self.max_latency, 3),
+            }
+
+
+def _open_source(folder: Path, use_inotify: bool):
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return _Inotify(folder)
+        except (OSError, AttributeError):
+            pass
+    return _Poller(folder)
+
+
+def _is_stale(file_path: Path, output_folder: Path, options: ProcessOptions) -> bool:
+    """Whether the output is missing or older than its input."""
+    target = output_path(file_path, output_folder, options)
+    return not target.exists() or target.stat().st_mtime_ns < file_path.stat().st_mtime_ns
+
+
+def watch(input_folder: Path, output_folder: Path, options: ProcessOptions = ProcessOptions(),
+          workers: int = 2, debounce: float = 2.0, interval: float = 1.0, use_inotify: bool = True,
+          stats_interval: float = 60.0, stop: Optional[threading.Event] = None,
+          stats: Optional[WatchStats] = None) -> WatchStats:
+    """
+    Process new or modified CSV files in input_folder until stopped.
+
+    The process and its imports stay warm between files. Changes are
+    picked up with inotify on Linux (polling otherwise), and a file is
+    only processed once it has been quiet for debounce seconds, so files
+    still being written are not read half-way. Files are processed on a
+    worker pool; a file that changes while running is queued again. On
+    start, files whose output is missing or older than the input are queued.
+
+    Args:
+        input_folder: Folder to watch
+        output_folder: Folder for results
+        options: Per-file processing settings
+        workers: Worker threads processing files
+        debounce: Quiet period (seconds) before a changed file is processed
+        interval: Event wait / polling interval in seconds
+        use_inotify: Use inotify when available
+        stats_interval: Seconds between counter printouts (0 to disable)
+        stop: Event that ends the loop when set
+        stats: Counters to update (a new WatchStats by default)
+
+    Returns:
+        The counters when the loop ends
+    """
+    input_folder = Path(input_folder)
+    output_folder = Path(output_folder)
+    output_folder.mkdir(parents=True, exist_ok=True)
+    stop = stop or threading.Event()
+    stats = stats or WatchStats()
+
+    # path -> (time of first unprocessed change, time of latest change)
+    pending: Dict[Path, Tuple[float, float]] = {}
+    running: Dict[Path, Future] = {}
+    started: Dict[Path, float] = {}
+    now = time.monotonic()
+    for path in sorted(input_folder.glob("*.csv")):
+        if _is_stale(path, output_folder, options):
+            pending[path] = (now, now - debounce)
+            stats.detected += 1
+
+    source = _open_source(input_folder, use_inotify)
+    last_report = time.monotonic()
+    print(f"Watching {input_folder} ({type(source).__name__.strip('_')}), writing to {output_folder}")
+
+    def run(path: Path) -> None:
+        process_file(path, output_folder, options)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while not stop.is_set():
+                for name in source.read(interval if not pending else min(interval, debounce)):
+                    if not name.endswith(".csv"):
+                        continue
+                    path = input_folder / name
+                    first = pending[path][0] if path in pending else time.monotonic()
+                    pending[path] = (first, time.monotonic())
+                    stats.detected += 1
+
+                # Collect finished files
+                for path, future in list(running.items()):
+                    if future.done():
+                        del running[path]
+                        error = future.exception()
+                        stats.record(time.monotonic() - started.pop(path), error is None)
+                        if error is None:
+                            print(f"Processed {path.name}")
+                        else:
+                            print(f"Error processing {path.name}: {error}")
+
+                # Submit files that have been quiet long enough and are not already running
+                now = time.monotonic()
+                for path, (first, last) in list(pending.items()):
+                    if now - last < debounce or path in running:
+                        continue
+                    del pending[path]
+                    # A deleted or renamed-away file has nothing to process; a new event re-adds it
+                    if path.exists():
+                        started[path] = first
+                        running[path] = pool.submit(run, path)
+
+                with stats._lock:
+                    stats.pending = len(pending)
+                    stats.running = len(running)
+
+                if stats_interval and now - last_report >= stats_interval:
+                    print(f"watch stats: {stats.snapshot()}")
+                    last_report = now
+    finally:
+        source.close()
+
+    for path, future in running.items():
+        stats.record(time.monotonic() - started[path], future.exception() is None)
+    return stats
@@ -0,0 +1,91 @@
+# test_sweep.py
+
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+
+from ind import IndicatorProcessor
+from ind.sweep import atr_table, rsi_table, sweep_atr, sweep_macd, sweep_rsi
+
+PERIODS = [2, 5, 14, 14, 21, 5]
+
+
+@pytest.fixture(scope="module")
+def prices():
+    rng = np.random.default_rng(7)
+    n = 5_000
+    close = 100 + np.cumsum(rng.normal(0, 0.2, n))
+    high = close + rng.uniform(0, 0.3, n)
+    low = close - rng.uniform(0, 0.3, n)
+    return high, low, close
+
+
+@pytest.fixture(scope="module")
+def processor(prices):
+    high, low, close = prices
+    n = len(close)
+    df = pd.DataFrame({
+        "Datetime": pd.date_range("2025-07-01 09:30", periods=n, freq="min"),
+        "Adj Close": close, "Close": close, "High": high, "Low": low, "Open": close,
+        "Volume": np.full(n, 1000.0),
+    })
+    return IndicatorProcessor.from_frame(df)
+
+
+@pytest.mark.parametrize("workers", [None, 4])
+def test_rsi_table_matches_talib(prices, workers):
+    _, _, close = prices
+    table = rsi_table(close, PERIODS, workers=workers)
+    assert sorted(table) == sorted(set(PERIODS))
+    for period, values in table.items():
+        np.testing.assert_array_equal(values, talib.RSI(close, timeperiod=period))
+
+
+@pytest.mark.parametrize("workers", [None, 4])
+def test_atr_table_matches_talib(prices, workers):
+    high, low, close = prices
+    table = atr_table(high, low, close, PERIODS, workers=workers)
+    assert sorted(table) == sorted(set(PERIODS))
+    for period, values in table.items():
+        np.testing.assert_array_equal(values, talib.ATR(high, low, close, timeperiod=period))
+
+
+def test_sweeps_keep_duplicate_periods(prices):
+    high, low, close = prices
+    rsi = sweep_rsi(close, PERIODS, workers=2)
+    atr = sweep_atr(high, low, close, PERIODS, workers=2)
+    assert rsi.columns == [f"RSI_{p}" for p in PERIODS]
+    assert atr.columns == [f"ATR_{p}" for p in PERIODS]
+    for j, period in enumerate(PERIODS):
+        np.testing.assert_array_equal(rsi.values[:, j], talib.RSI(close, timeperiod=period))
+        np.testing.assert_array_equal(atr.values[:, j], talib.ATR(high, low, close, timeperiod=period))
+
+
+def test_atr_period_and_periods_agree(processor, prices):
+    high, low, close = prices
+    single = processor.compute_indicator("ATR", period=10)
+    several = processor.compute_indicator("ATR", periods=[10, 20], workers=2)
+    assert list(single) == ["ATR_10"]
+    assert list(several) == ["ATR_10", "ATR_20"]
+    np.testing.assert_array_equal(single["ATR_10"], several["ATR_10"])
+    np.testing.assert_array_equal(several["ATR_20"], talib.ATR(high, low, close, timeperiod=20))
+
+
+def test_rsi_indicator_matches_talib(processor, prices):
+    _, _, close = prices
+    columns = processor.compute_indicator("RSI", periods=[5, 14], workers=2)
+    for period in (5, 14):
+        np.testing.assert_array_equal(columns[f"RSI_{period}"], talib.RSI(close, timeperiod=period))
+
+
+def test_sweep_macd_matches_indicator(processor, prices):
+    _, _, close = prices
+    triples = [(5, 13, 9), (12, 13, 9), (12, 26, 9), (5, 13, 3)]
+    result = sweep_macd(close, triples, workers=2)
+    frame = result.to_frame()
+    for triple in triples:
+        fast, slow, signal = triple
+        columns = processor.compute_indicator("MACD", fast=fast, slow=slow, signal=signal)
+        for name, values in columns.items():
+            np.testing.assert_array_equal(frame[name].to_numpy(), values)